@@ -4,13 +4,24 @@ from typing import Dict, List, Optional
 from app.ml.predictor import RacePredictor
 from app.models.race_state import (
     RaceState, Meta, Car, Track, Weather, Sector, SectorType,
-    TireState, TireCompound, RaceControl,
-    CarIdentity, CarTelemetry, CarSystems, CarStrategy, CarTiming
+    TireCompound, RaceControl,
 )
 
 router = APIRouter()
 predictor = RacePredictor()
 
+# Mock Track/Weather (predictor doesn't use them, but RaceState requires them).
+# Track is frozen, so every request shares this one instance.
+MOCK_TRACK = Track(
+    id="mock", name="mock", length=5000, 
+    sectors=[
+        Sector.get(SectorType.FAST, 1000),
+        Sector.get(SectorType.MEDIUM, 2000),
+        Sector.get(SectorType.SLOW, 2000)
+    ], 
+    weather=Weather(rain_probability=0, temperature=20, wind_speed=0)
+)
+
 # --- Request Models (Matching Frontend format_race_state) ---
 class FrontendCar(BaseModel):
     driver: str
@@ -61,45 +72,24 @@ def get_predictions(data: FrontendState):
     Accepts frontend state and converts to internal RaceState for the predictor.
     """
     try:
-        # Mock Track/Weather (predictor doesn't use them, but RaceState requires them)
-        mock_track = Track(
-            id="mock", name="mock", length=5000, 
-            sectors=[
-                Sector(sector_type=SectorType.FAST, length=1000),
-                Sector(sector_type=SectorType.MEDIUM, length=2000),
-                Sector(sector_type=SectorType.SLOW, length=2000)
-            ], 
-            weather=Weather(rain_probability=0, temperature=20, wind_speed=0)
-        )
-        
         cars = []
         for f_car in data.cars:
-            # Construct refactored Car with sub-models
-            car = Car(
-                identity=CarIdentity(
-                    driver=f_car.driver,
-                    team=f_car.team
-                ),
-                telemetry=CarTelemetry(
-                    speed=f_car.speed,
-                    fuel=0,
-                    lap_progress=f_car.lap_progress,
-                    tire_state=TireState(
-                        compound=TireCompound(f_car.tire_compound),
-                        age=f_car.tire_age,
-                        wear=f_car.tire_wear / 100.0
-                    )
-                ),
-                systems=CarSystems(drs_active=f_car.drs_active),
-                strategy=CarStrategy(),
-                timing=CarTiming(
-                    position=f_car.position,
-                    lap=f_car.lap,
-                    sector=0,
-                    gap_to_leader=f_car.gap_to_leader,
-                    interval=f_car.interval
-                ),
-                pit_stops=f_car.pit_stops
+            car = Car.from_flat(
+                driver=f_car.driver,
+                team=f_car.team,
+                speed=f_car.speed,
+                fuel=0,
+                lap_progress=f_car.lap_progress,
+                compound=TireCompound(f_car.tire_compound),
+                tire_age=f_car.tire_age,
+                tire_wear=f_car.tire_wear / 100.0,
+                drs_active=f_car.drs_active,
+                position=f_car.position,
+                lap=f_car.lap,
+                sector=0,
+                gap_to_leader=f_car.gap_to_leader,
+                interval=f_car.interval,
+                pit_stops=f_car.pit_stops,
             )
             cars.append(car)
 
@@ -111,14 +101,14 @@ def get_predictions(data: FrontendState):
             except ValueError:
                 pass
         # Backwards compat: honour legacy boolean fields if race_control wasn't explicit
-        if rc == RaceControl.GREEN and data.safety_car_active:
+        if rc is RaceControl.GREEN and data.safety_car_active:
             rc = RaceControl.SAFETY_CAR
-        elif rc == RaceControl.GREEN and data.vsc_active:
+        elif rc is RaceControl.GREEN and data.vsc_active:
             rc = RaceControl.VSC
 
         state = RaceState(
             meta=Meta(seed=0, tick=data.tick, timestamp=0, laps_total=data.total_laps),
-            track=mock_track,
+            track=MOCK_TRACK,
             cars=cars,
             race_control=rc,
             drs_enabled=data.drs_enabled
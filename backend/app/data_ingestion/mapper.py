@@ -7,6 +7,7 @@ and filters drivers to match our supported synthetic roster.
 """
 
 from datetime import timedelta
+from operator import attrgetter
 import pandas as pd
 import numpy as np
 
@@ -169,7 +170,7 @@ def map_real_race_to_states(session) -> list[RaceState]:
         # Create the state snapshot
         if cars:
             # Sort cars by position to ensure array order matches reality
-            cars.sort(key=lambda c: c.timing.position)
+            cars.sort(key=attrgetter("timing.position"))
             
             state = RaceState(
                 meta=Meta(
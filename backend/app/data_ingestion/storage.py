@@ -38,6 +38,8 @@ def save_race(season: int, round_num: int, states: List[RaceState]) -> str:
         # Batch insert for performance
         state_models = []
         telemetry_models = []
+        # Fallback time for states without a simulation timestamp (one clock read per ingest)
+        ingest_time = datetime.utcnow()
 
         for s in states:
             # Race State
@@ -51,7 +53,7 @@ def save_race(season: int, round_num: int, states: List[RaceState]) -> str:
             state_models.append(db_state)
 
             # Telemetry for each car
-            dt_time = datetime.fromtimestamp(s.meta.timestamp / 1000.0) if s.meta.timestamp > 0 else datetime.utcnow()
+            dt_time = datetime.fromtimestamp(s.meta.timestamp / 1000.0) if s.meta.timestamp > 0 else ingest_time
             for car in s.cars:
                 t_model = TelemetryModel(
                     time=dt_time,
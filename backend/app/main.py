@@ -3,6 +3,8 @@ FastAPI server for BOX-BOX F1 Scenario Simulator
 Provides REST API for stateless ML scenario predictions
 """
 
+from operator import attrgetter
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -13,6 +15,7 @@ from .scenarios.types import ScenarioConfig
 from .scenarios.compiler import compile_scenario
 from .api import ml, reality, ws
 from .ml.predictor import RacePredictor
+from .models.race_state import DRS_ZONES_ADAPTER
 
 app = FastAPI(
     title="BOX-BOX F1 Scenario Prediction Engine",
@@ -67,7 +70,7 @@ def get_tracks():
             "pit_lap_window": track.pit_lap_window,
             "pit_stop_loss": track.pit_stop_loss,
             "chaos_level": track.chaos_level,
-            "drs_zones": [z.dict() for z in track.drs_zones],
+            "drs_zones": DRS_ZONES_ADAPTER.dump_python(track.drs_zones),
             "weather": {
                 "rain_probability": track.weather.rain_probability,
                 "temperature": track.weather.temperature
@@ -115,7 +118,7 @@ def predict_scenario_outcome(config: ScenarioConfig, mode: str = "standard", int
                 "driving_mode": c.strategy.driving_mode.value,
                 "best_lap_time": c.timing.best_lap_time,
             }
-            for c in sorted(state.cars, key=lambda c: c.timing.position)
+            for c in sorted(state.cars, key=attrgetter("timing.position"))
         ]
         
         config_dict = config.model_dump()
@@ -0,0 +1,51 @@
+"""
+Categorical vocabularies shared by model training and inference.
+
+Codes are positions in the sorted lists (unknown labels encode to -1).
+Training scripts persist the lists next to the models so predictors load
+exactly the encoding a model was fitted with.
+"""
+
+import json
+from typing import Dict, List
+
+# 2025 grid (race win/podium models)
+DRIVERS: List[str] = sorted([
+    "VER", "HAM", "LEC", "NOR", "RUS", "SAI", "ALO", "PIA",
+    "GAS", "ALB", "HUL", "OCO", "TSU", "LAW", "STR",
+    "ANT", "BEA", "DOO", "HAD", "BOR"
+])
+
+TEAMS: List[str] = sorted([
+    "Red Bull Racing", "Mercedes", "Ferrari", "McLaren", "Aston Martin",
+    "Alpine", "Williams", "Racing Bulls", "Haas", "Sauber"
+])
+
+TIRE_COMPOUNDS: List[str] = sorted([
+    "SOFT", "MEDIUM", "HARD", "INTERMEDIATE", "WET"
+])
+
+# Pit model was trained on real-race data where the team is still named "RB"
+PIT_TEAMS: List[str] = sorted([
+    "Red Bull Racing", "Mercedes", "Ferrari", "McLaren", "Aston Martin",
+    "Alpine", "Williams", "RB", "Haas", "Sauber"
+])
+
+RACE_ENCODERS_FILE = "encoders.json"
+PIT_ENCODERS_FILE = "pit_encoders.json"
+
+
+def save_encoders(path: str, encoders: Dict[str, List[str]]):
+    with open(path, "w") as f:
+        json.dump(encoders, f, indent=2)
+
+
+def load_encoders(path: str, defaults: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Load persisted vocabularies, falling back to the defaults for missing keys/files."""
+    encoders = dict(defaults)
+    try:
+        with open(path, "r") as f:
+            encoders.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    return {key: sorted(values) for key, values in encoders.items()}
@@ -1,111 +1,142 @@
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional
+
+import numpy as np
 import pandas as pd
-from typing import List, Dict
 
 DATA_DIR = "./data/real_races"
 OUTPUT_DIR = "./app/ml/data"
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "pit_strategy_data.csv")
 
-def extract_features():
+
+@dataclass
+class DriverHistory:
+    """Per-driver lap history stored column-wise (one list per feature)."""
+    lap: List[int] = field(default_factory=list)
+    position: List[int] = field(default_factory=list)
+    tire_age: List[int] = field(default_factory=list)
+    tire_wear: List[float] = field(default_factory=list)
+    tire_compound: List[str] = field(default_factory=list)
+    gap_to_ahead: List[float] = field(default_factory=list)
+    sc_active: List[int] = field(default_factory=list)
+    vsc_active: List[int] = field(default_factory=list)
+    pit_stops: List[int] = field(default_factory=list)
+    team: List[str] = field(default_factory=list)
+
+    def to_frame(self, driver: str) -> pd.DataFrame:
+        """Label lap N with whether the driver pitted on lap N+1."""
+        order = np.argsort(np.asarray(self.lap, dtype=np.int32), kind="stable")
+        lap = np.asarray(self.lap, dtype=np.int32)[order]
+        pit_stops = np.asarray(self.pit_stops, dtype=np.int32)[order]
+        tire_age = np.asarray(self.tire_age, dtype=np.int32)[order]
+
+        # Pit detected if the stop count increased or tyre age dropped
+        did_pit = (pit_stops[1:] > pit_stops[:-1]) | (tire_age[1:] < tire_age[:-1])
+
+        current = order[:-1]
+        return pd.DataFrame({
+            "lap": lap[:-1],
+            "driver": driver,
+            "team": np.asarray(self.team, dtype=object)[current],
+            "position": np.asarray(self.position, dtype=np.int32)[current],
+            "tire_age": tire_age[:-1],
+            "tire_wear": np.asarray(self.tire_wear, dtype=np.float32)[current],
+            "tire_compound": np.asarray(self.tire_compound, dtype=object)[current],
+            "gap_to_ahead": np.asarray(self.gap_to_ahead, dtype=np.float32)[current],
+            "sc_active": np.asarray(self.sc_active, dtype=np.int8)[current],
+            "vsc_active": np.asarray(self.vsc_active, dtype=np.int8)[current],
+            "pit_stops": pit_stops[:-1],
+            "pit_next_lap": did_pit.astype(np.int8),
+        })
+
+
+def extract_race(filepath: str) -> Optional[pd.DataFrame]:
+    """Extract labelled pit rows from a single recorded race file."""
+    with open(filepath, "r") as f:
+        try:
+            states = json.load(f)
+        except Exception as e:
+            print(f"Error loading {filepath}: {e}")
+            return None
+    
+    # Sort states by lap (assuming ticks are monotonically increasing per lap)
+    # In mapper, tick = lap_num * 1000
+    states.sort(key=lambda x: x["meta"]["tick"])
+    
+    print(f"Processing {os.path.basename(filepath)} with {len(states)} laps...")
+
+    # We need to map driver -> list of states (lap, status, tire_age, etc)
+    # to determine if they pitted on lap N+1
+    driver_history: Dict[str, DriverHistory] = {}
+    for state in states:
+        lap = state["meta"]["tick"] // 1000
+        race_control = state["race_control"]
+        sc_active = 1 if race_control == "SAFETY_CAR" else 0
+        vsc_active = 1 if race_control == "VSC" else 0
+        
+        for car in state["cars"]:
+            driver = car["identity"]["driver"]
+            history = driver_history.get(driver)
+            if history is None:
+                history = driver_history[driver] = DriverHistory()
+            
+            # Gap to ahead
+            gap_to_ahead = car["timing"]["interval"]
+            if gap_to_ahead is None:
+                gap_to_ahead = 999.0 # Leader
+            
+            # We save all relevant features for THIS lap
+            tire_state = car["telemetry"]["tire_state"]
+            history.lap.append(lap)
+            history.position.append(car["timing"]["position"])
+            history.tire_age.append(tire_state["age"])
+            history.tire_wear.append(tire_state["wear"])
+            history.tire_compound.append(tire_state["compound"])
+            history.gap_to_ahead.append(gap_to_ahead)
+            history.sc_active.append(sc_active)
+            history.vsc_active.append(vsc_active)
+            history.pit_stops.append(car["pit_stops"])
+            history.team.append(car["identity"]["team"])
+
+    # Now label the data
+    # For each driver, for lap N, check if pit_stops increased on lap N+1
+    # or tire_age dropped significantly.
+    frames = [
+        history.to_frame(driver)
+        for driver, history in driver_history.items()
+        if len(history.lap) > 1
+    ]
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True)
+
+
+def extract_features(max_workers: Optional[int] = None):
     if not os.path.exists(DATA_DIR):
         print(f"Directory {DATA_DIR} not found. Please run the data ingestion pipeline first.")
         return
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    all_rows = []
-
-    for filename in os.listdir(DATA_DIR):
-        if not filename.endswith(".json"):
-            continue
-
-        filepath = os.path.join(DATA_DIR, filename)
-        with open(filepath, "r") as f:
-            try:
-                states = json.load(f)
-            except Exception as e:
-                print(f"Error loading {filepath}: {e}")
-                continue
-        
-        # Sort states by lap (assuming ticks are monotonically increasing per lap)
-        # In mapper, tick = lap_num * 1000
-        states.sort(key=lambda x: x["meta"]["tick"])
-        
-        print(f"Processing {filename} with {len(states)} laps...")
-
-        # We need to map driver -> list of states (lap, status, tire_age, etc)
-        # to determine if they pitted on lap N+1
-        driver_history = {}
-        for state in states:
-            lap = state["meta"]["tick"] // 1000
-            race_control = state["race_control"]
-            sc_active = 1 if race_control == "SAFETY_CAR" else 0
-            vsc_active = 1 if race_control == "VSC" else 0
-            
-            for car in state["cars"]:
-                driver = car["identity"]["driver"]
-                if driver not in driver_history:
-                    driver_history[driver] = []
-                
-                # Gap to ahead
-                gap_to_ahead = car["timing"]["interval"]
-                if gap_to_ahead is None:
-                    gap_to_ahead = 999.0 # Leader
-                
-                # We save all relevant features for THIS lap
-                driver_history[driver].append({
-                    "lap": lap,
-                    "position": car["timing"]["position"],
-                    "tire_age": car["telemetry"]["tire_state"]["age"],
-                    "tire_wear": car["telemetry"]["tire_state"]["wear"],
-                    "tire_compound": car["telemetry"]["tire_state"]["compound"],
-                    "gap_to_ahead": gap_to_ahead,
-                    "sc_active": sc_active,
-                    "vsc_active": vsc_active,
-                    "pit_stops": car["pit_stops"],
-                    "team": car["identity"]["team"]
-                })
-
-        # Now label the data
-        # For each driver, for lap N, check if pit_stops increased on lap N+1
-        # or tire_age dropped significantly.
-        for driver, history in driver_history.items():
-            # Ensure history is sorted by lap
-            history.sort(key=lambda x: x["lap"])
-            
-            for i in range(len(history) - 1):
-                current = history[i]
-                nxt = history[i + 1]
-                
-                # Did pit occur?
-                # Easiest check: did pit_stops count increase?
-                did_pit = int(nxt["pit_stops"] > current["pit_stops"])
-                
-                # Alternative check: did tire age drop? (e.g. from 15 to 0)
-                if nxt["tire_age"] < current["tire_age"]:
-                    did_pit = 1
-                    
-                row = {
-                    "lap": current["lap"],
-                    "driver": driver,
-                    "team": current["team"],
-                    "position": current["position"],
-                    "tire_age": current["tire_age"],
-                    "tire_wear": current["tire_wear"],
-                    "tire_compound": current["tire_compound"],
-                    "gap_to_ahead": current["gap_to_ahead"],
-                    "sc_active": current["sc_active"],
-                    "vsc_active": current["vsc_active"],
-                    "pit_stops": current["pit_stops"],
-                    "pit_next_lap": did_pit
-                }
-                all_rows.append(row)
-
-    if not all_rows:
+
+    filepaths = [
+        os.path.join(DATA_DIR, filename)
+        for filename in os.listdir(DATA_DIR)
+        if filename.endswith(".json")
+    ]
+
+    # Races are independent, so each file is parsed in its own worker process.
+    # map() keeps results in file order so the CSV is deterministic.
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        frames = [df for df in ex.map(extract_race, filepaths) if df is not None]
+
+    if not frames:
         print("No data extracted.")
         return
 
-    df = pd.DataFrame(all_rows)
+    df = pd.concat(frames, ignore_index=True)
     df.to_csv(OUTPUT_FILE, index=False)
     print(f"Successfully extracted {len(df)} rows to {OUTPUT_FILE}")
     
@@ -1,59 +1,80 @@
+from typing import Dict, List
+
 import pandas as pd
 from app.models.race_state import RaceState, RaceControl
 
-def extract_features(state: RaceState) -> pd.DataFrame:
+def _columns(state: RaceState) -> Dict[str, List]:
     """
-    Converting a Racestate into pandas DataFrame suitable for ML models.
+    Converting a RaceState into ML feature columns (one list per feature).
+    Callers collecting many ticks should merge these and build a single DataFrame.
     """
-    features = []
-
     total_laps = state.meta.laps_total
+    tick = state.meta.tick
+
+    # Race control flags are the same for every car on this tick
+    sc_active = 1 if state.race_control is RaceControl.SAFETY_CAR else 0
+    vsc_active = 1 if state.race_control is RaceControl.VSC else 0
+    drs_enabled = 1 if state.drs_enabled else 0
+
+    columns: Dict[str, List] = {
+        # --- Identity ---
+        "driver": [], "team": [],
+        # --- Race Context ---
+        "sim_tick": [], "lap": [], "lap_progress": [], "laps_remaining": [], "position": [],
+        # --- Performance Metrics ---
+        "speed": [], "gap_to_leader": [], "gap_to_car_ahead": [],
+        # --- Car State ---
+        "tire_age": [], "tire_wear": [], "tire_compound": [], "fuel": [], "pit_stops": [],
+        # --- Race Control Flags ---
+        "sc_active": [], "vsc_active": [], "drs_enabled": [],
+        # --- Driver Personality ---
+        "aggression": [], "consistency": [], "wet_skill": [], "tire_management": [], "risk_tolerance": [],
+    }
 
     for car in state.cars:
-        # Calculate derived metrics
-        laps_remaining = total_laps - car.timing.lap
+        timing = car.timing
+        telemetry = car.telemetry
+        tire_state = telemetry.tire_state
+        personality = car.personality
 
         # Handle None values for gaps (leader or first lap)
-        gap_leader = car.timing.gap_to_leader if car.timing.gap_to_leader is not None else 0.0
-        interval_ahead = car.timing.interval if car.timing.interval is not None else 0.0
-        
-        features_row = {
-            # --- Identity ---
-            "driver": car.identity.driver,
-            "team": car.identity.team,
-
-            # --- Race Context ---
-            "sim_tick": state.meta.tick,
-            "lap": car.timing.lap,
-            "lap_progress": car.telemetry.lap_progress,
-            "laps_remaining": laps_remaining,
-            "position": car.timing.position,
-
-            # --- Performance Metrics ---
-            "speed": car.telemetry.speed,
-            "gap_to_leader": gap_leader,
-            "gap_to_car_ahead": interval_ahead,
-
-            # --- Car State ---
-            "tire_age": car.telemetry.tire_state.age,
-            "tire_wear": car.telemetry.tire_state.wear,
-            "tire_compound": car.telemetry.tire_state.compound.value,
-            "fuel": car.telemetry.fuel,
-            "pit_stops": car.pit_stops,
-
-            # --- Race Control Flags ---
-            "sc_active": 1 if state.race_control == RaceControl.SAFETY_CAR else 0,
-            "vsc_active": 1 if state.race_control == RaceControl.VSC else 0,
-            "drs_enabled": 1 if state.drs_enabled else 0,
-            
-            # --- Driver Personality ---
-            "aggression": car.personality.get("aggression", 0.9),
-            "consistency": car.personality.get("consistency", 0.9),
-            "wet_skill": car.personality.get("wet_skill", 0.9),
-            "tire_management": car.personality.get("tire_management", 0.9),
-            "risk_tolerance": car.personality.get("risk_tolerance", 0.85),
-        }
-
-        features.append(features_row)
-
-    return pd.DataFrame(features)
\ No newline at end of file
+        gap_leader = timing.gap_to_leader if timing.gap_to_leader is not None else 0.0
+        interval_ahead = timing.interval if timing.interval is not None else 0.0
+
+        columns["driver"].append(car.identity.driver)
+        columns["team"].append(car.identity.team)
+
+        columns["sim_tick"].append(tick)
+        columns["lap"].append(timing.lap)
+        columns["lap_progress"].append(telemetry.lap_progress)
+        columns["laps_remaining"].append(total_laps - timing.lap)
+        columns["position"].append(timing.position)
+
+        columns["speed"].append(telemetry.speed)
+        columns["gap_to_leader"].append(gap_leader)
+        columns["gap_to_car_ahead"].append(interval_ahead)
+
+        columns["tire_age"].append(tire_state.age)
+        columns["tire_wear"].append(tire_state.wear)
+        columns["tire_compound"].append(tire_state.compound.value)
+        columns["fuel"].append(telemetry.fuel)
+        columns["pit_stops"].append(car.pit_stops)
+
+        columns["sc_active"].append(sc_active)
+        columns["vsc_active"].append(vsc_active)
+        columns["drs_enabled"].append(drs_enabled)
+
+        columns["aggression"].append(personality.get("aggression", 0.9))
+        columns["consistency"].append(personality.get("consistency", 0.9))
+        columns["wet_skill"].append(personality.get("wet_skill", 0.9))
+        columns["tire_management"].append(personality.get("tire_management", 0.9))
+        columns["risk_tolerance"].append(personality.get("risk_tolerance", 0.85))
+
+    return columns
+
+
+def extract_features(state: RaceState) -> pd.DataFrame:
+    """
+    Converting a Racestate into pandas DataFrame suitable for ML models.
+    """
+    return pd.DataFrame(_columns(state))
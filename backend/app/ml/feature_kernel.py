@@ -0,0 +1,56 @@
+"""
+Numeric feature assembly for the race win/podium models.
+
+Works on the structure-of-arrays view (RaceState.arrays) so the whole grid is
+filled with a handful of vectorized column writes instead of a per-car loop.
+"""
+
+import numpy as np
+
+from app.models.race_state import CarArrays
+
+# Column order MUST match training (train_model.py)
+FEATURE_COLS = [
+    "lap", "lap_progress", "laps_remaining", "position",
+    "speed", "gap_to_leader", "gap_to_car_ahead",
+    "tire_age", "tire_wear", "pit_stops",
+    "sc_active", "vsc_active", "drs_enabled",
+    "tire_compound_code", "team_code", "driver_code"
+]
+
+
+def build_features(
+    arrays: CarArrays,
+    total_laps: int,
+    sc_active: bool,
+    vsc_active: bool,
+    drs_enabled: bool,
+    tire_codes: np.ndarray,
+    team_codes: np.ndarray,
+    driver_codes: np.ndarray,
+    out: np.ndarray,
+) -> np.ndarray:
+    """
+    Fill `out` (n_cars x len(FEATURE_COLS)) in FEATURE_COLS order and return it.
+    Missing gaps (leader / first lap) become 0.0, unknown categoricals stay -1.
+    """
+    out[:, 0] = arrays.lap
+    out[:, 1] = arrays.lap_progress
+    out[:, 2] = total_laps - arrays.lap
+    out[:, 3] = arrays.position
+    out[:, 4] = arrays.speed
+    out[:, 5] = arrays.gap_to_leader
+    out[:, 6] = arrays.interval
+    np.nan_to_num(out[:, 5:7], copy=False, nan=0.0)
+    out[:, 7] = arrays.tire_age
+    out[:, 8] = arrays.tire_wear
+    out[:, 9] = arrays.pit_stops
+
+    # Race control flags are constant across the grid
+    out[:, 10] = 1 if sc_active else 0
+    out[:, 11] = 1 if vsc_active else 0
+    out[:, 12] = 1 if drs_enabled else 0
+    out[:, 13] = tire_codes
+    out[:, 14] = team_codes
+    out[:, 15] = driver_codes
+    return out
@@ -12,10 +12,8 @@ v3 CHANGES:
 - Championship pressure on mistake rates
 """
 
-import math
 import numpy as np
 from typing import Dict, List, Optional
-from collections import Counter, defaultdict
 
 
 class MonteCarloRaceSimulator:
@@ -138,237 +136,203 @@ class MonteCarloRaceSimulator:
             for d in drivers
         ])
 
-        # Track results
-        win_counts = Counter()
-        position_counts = defaultdict(lambda: Counter())
-
-        for _ in range(n):
-            # =========================================================
-            # LAYER 2: Performance Drift — weekend form variance
-            # =========================================================
-            # Each sim represents a "possible weekend" where drivers have form variance
-            form_sigma = 0.24 if driver_form_drift else 0.12  # P4: doubled when drift enabled
-            form_drift_arr = self.rng.normal(0, form_sigma, size=n_drivers)
-            
-            # Team execution variance
-            team_drift = self.rng.normal(0, 0.06, size=n_drivers)
-            
-            # Clustered chaos: occasionally spike noise for this sim
-            chaos_burst = 1.0
-            if chaos_scaling == "clustered" and self.rng.random() < 0.20:
-                chaos_burst = 2.5  # 20% of sims get a chaos burst
-            
-            # Apply drift to strengths for this sim
-            sim_strengths = strengths * np.exp(form_drift_arr + team_drift)
-            sim_strengths = np.maximum(sim_strengths, 1e-6)
-
-            # =========================================================
-            # LAYER 2.5: Fatigue Drift — concentration loss over race
-            # =========================================================
-            # Simulates accumulated fatigue: some drivers lose more concentration
-            fatigue_vulnerability = self.rng.uniform(0.85, 1.0, size=n_drivers)
-            sim_strengths *= fatigue_vulnerability
-
-            # =========================================================
-            # LAYER 2.6: Nonlinear Tire Cliff
-            # =========================================================
-            # 5% chance per driver of hitting a sudden tire cliff
-            for j in range(n_drivers):
-                if self.rng.random() < 0.05:
-                    cliff_severity = self.rng.uniform(0.15, 0.40)
-                    sim_strengths[j] *= cliff_severity
-
-            # =========================================================
-            # LAYER 3: Shock Events — heavy-tail incidents
-            # =========================================================
-            for j in range(n_drivers):
-                if self.rng.random() < base_incident_prob:
-                    # Incident! Apply heavy-tail penalty (exponential distribution)
-                    # This can range from minor (0.3x strength) to catastrophic DNF (0.01x)
-                    shock_severity = self.rng.exponential(0.5)
-                    penalty = max(0.01, 1.0 - shock_severity)
-                    sim_strengths[j] *= penalty
-
-            # =========================================================
-            # LAYER 4: Driver Mistake Model — rare catastrophic errors
-            # =========================================================
-            for j in range(n_drivers):
-                # RL-informed mistake probability per driver, scaled by relative strength and chaos
-                relative_strength = raw_strengths[j] / raw_strengths.max()
-                mistake_prob = driver_mistake_probs[j] * (2.0 - relative_strength) * chaos_level
-                
-                if self.rng.random() < min(0.08, mistake_prob):
-                    # Catastrophic mistake: spin, crash, or major error
-                    sim_strengths[j] *= self.rng.uniform(0.01, 0.15)
-
-            # =========================================================
-            # LAYER 5.5: Strategy Execution Risk
-            # =========================================================
-            # Pit stop delay: 3% chance of slow pit per driver
-            for j in range(n_drivers):
-                if self.rng.random() < 0.03:
-                    pit_penalty = self.rng.uniform(0.60, 0.85)
-                    sim_strengths[j] *= pit_penalty
-            
-            # Cold tire penalty: 8% chance per driver of cold-tire struggle
-            for j in range(n_drivers):
-                if self.rng.random() < 0.08:
-                    cold_tire_penalty = self.rng.uniform(0.75, 0.90)
-                    sim_strengths[j] *= cold_tire_penalty
-
-            # =========================================================
-            # LAYER 5.6: Incident-Driven Safety Car / VSC (v3)
-            # =========================================================
-            # Instead of flat 8%, SC probability is derived from:
-            # 1. Track chaos level
-            # 2. Whether any drivers had incidents in this sim
-            sc_triggered = False
-            vsc_triggered = False
-            incident_count = sum(1 for j in range(n_drivers) 
-                                if sim_strengths[j] / max(strengths[j], 1e-6) < 0.3)  # severe incidents
-            
-            # Base probability + incident-driven boost
-            sc_prob = track_sc_probability * chaos_level * 0.15  # ~3% base at neutral
-            if incident_count > 0:
-                sc_prob += 0.40 * incident_count  # 40% per incident
-            
-            if self.rng.random() < min(0.60, sc_prob):  # Cap at 60%
-                if self.rng.random() < 0.30:
-                    # VSC (30% of triggered) — lighter compression
-                    vsc_triggered = True
-                    mean_strength = sim_strengths.mean()
-                    sim_strengths = sim_strengths * 0.60 + mean_strength * 0.40
-                else:
-                    # Full Safety Car — heavy compression
-                    sc_triggered = True
-                    mean_strength = sim_strengths.mean()
-                    sim_strengths = sim_strengths * 0.30 + mean_strength * 0.70
-
-            # =========================================================
-            # LAYER 5.7: DRS Train Cluster Penalty (v3)
-            # =========================================================
-            # Simulate drivers stuck in traffic getting penalized
-            # Sort by current sim strength, apply dirty air cascade
-            strength_order = np.argsort(-sim_strengths)
-            for rank in range(1, n_drivers):
-                idx = strength_order[rank]
-                leader_idx = strength_order[rank - 1]
-                # If close in strength (within 15%), dirty air penalty
-                ratio = sim_strengths[idx] / max(sim_strengths[leader_idx], 1e-6)
-                if ratio > 0.85:
-                    # In dirty air — 0.97x penalty
-                    sim_strengths[idx] *= 0.97
-
-            # =========================================================
-            # LAYER 6: Driver Interaction — Dynamic Rivalry (v3)
-            # =========================================================
+        # All sims run in lockstep: every per-sim quantity below is an (n, n_drivers)
+        # array (one row per simulated weekend), so each layer is a handful of
+        # vectorized draws instead of a Python loop per sim and per driver.
+        rng = self.rng
+        shape = (n, n_drivers)
+
+        # =========================================================
+        # LAYER 2: Performance Drift — weekend form variance
+        # =========================================================
+        # Each sim represents a "possible weekend" where drivers have form variance
+        form_sigma = 0.24 if driver_form_drift else 0.12  # P4: doubled when drift enabled
+        form_drift_arr = rng.normal(0, form_sigma, size=shape)
+
+        # Team execution variance
+        team_drift = rng.normal(0, 0.06, size=shape)
+
+        # Clustered chaos: occasionally spike noise for a sim (20% of sims get a burst)
+        chaos_burst = np.ones(n)
+        if chaos_scaling == "clustered":
+            chaos_burst[rng.random(n) < 0.20] = 2.5
+
+        # Apply drift to strengths for each sim
+        sim_strengths = strengths * np.exp(form_drift_arr + team_drift)
+        sim_strengths = np.maximum(sim_strengths, 1e-6)
+
+        # =========================================================
+        # LAYER 2.5: Fatigue Drift — concentration loss over race
+        # =========================================================
+        # Simulates accumulated fatigue: some drivers lose more concentration
+        sim_strengths *= rng.uniform(0.85, 1.0, size=shape)
+
+        # =========================================================
+        # LAYER 2.6: Nonlinear Tire Cliff
+        # =========================================================
+        # 5% chance per driver of hitting a sudden tire cliff
+        cliff = rng.random(shape) < 0.05
+        sim_strengths[cliff] *= rng.uniform(0.15, 0.40, size=int(cliff.sum()))
+
+        # =========================================================
+        # LAYER 3: Shock Events — heavy-tail incidents
+        # =========================================================
+        # Incident! Apply heavy-tail penalty (exponential distribution)
+        # This can range from minor (0.3x strength) to catastrophic DNF (0.01x)
+        shock = rng.random(shape) < base_incident_prob
+        shock_severity = rng.exponential(0.5, size=int(shock.sum()))
+        sim_strengths[shock] *= np.maximum(0.01, 1.0 - shock_severity)
+
+        # =========================================================
+        # LAYER 4: Driver Mistake Model — rare catastrophic errors
+        # =========================================================
+        # RL-informed mistake probability per driver, scaled by relative strength and chaos
+        relative_strength = raw_strengths / raw_strengths.max()
+        mistake_prob = np.minimum(0.08, driver_mistake_probs * (2.0 - relative_strength) * chaos_level)
+        # Catastrophic mistake: spin, crash, or major error
+        mistake = rng.random(shape) < mistake_prob
+        sim_strengths[mistake] *= rng.uniform(0.01, 0.15, size=int(mistake.sum()))
+
+        # =========================================================
+        # LAYER 5.5: Strategy Execution Risk
+        # =========================================================
+        # Pit stop delay: 3% chance of slow pit per driver
+        slow_pit = rng.random(shape) < 0.03
+        sim_strengths[slow_pit] *= rng.uniform(0.60, 0.85, size=int(slow_pit.sum()))
+
+        # Cold tire penalty: 8% chance per driver of cold-tire struggle
+        cold_tire = rng.random(shape) < 0.08
+        sim_strengths[cold_tire] *= rng.uniform(0.75, 0.90, size=int(cold_tire.sum()))
+
+        # =========================================================
+        # LAYER 5.6: Incident-Driven Safety Car / VSC (v3)
+        # =========================================================
+        # Instead of flat 8%, SC probability is derived from:
+        # 1. Track chaos level
+        # 2. Whether any drivers had incidents in this sim
+        strength_floor = np.maximum(strengths, 1e-6)
+        incident_count = (sim_strengths / strength_floor < 0.3).sum(axis=1)  # severe incidents
+
+        # Base probability + incident-driven boost (~3% base at neutral, +40% per incident)
+        sc_prob = track_sc_probability * chaos_level * 0.15 + 0.40 * incident_count
+        neutralised = rng.random(n) < np.minimum(0.60, sc_prob)  # Cap at 60%
+        vsc = neutralised & (rng.random(n) < 0.30)
+        full_sc = neutralised & ~vsc
+
+        # VSC (30% of triggered) — lighter compression; full Safety Car — heavy compression
+        mean_strength = sim_strengths.mean(axis=1, keepdims=True)
+        sim_strengths = np.where(vsc[:, None], sim_strengths * 0.60 + mean_strength * 0.40, sim_strengths)
+        sim_strengths = np.where(full_sc[:, None], sim_strengths * 0.30 + mean_strength * 0.70, sim_strengths)
+
+        # =========================================================
+        # LAYER 5.7: DRS Train Cluster Penalty (v3)
+        # =========================================================
+        # Simulate drivers stuck in traffic getting penalized
+        # Sort by current sim strength, apply dirty air cascade (rank by rank,
+        # so a penalised car can pull the one behind it out of the train)
+        strength_order = np.argsort(-sim_strengths, axis=1)
+        sims = np.arange(n)
+        for rank in range(1, n_drivers):
+            idx = strength_order[:, rank]
+            leader_idx = strength_order[:, rank - 1]
+            # If close in strength (within 15%), dirty air penalty (0.97x)
+            ratio = sim_strengths[sims, idx] / np.maximum(sim_strengths[sims, leader_idx], 1e-6)
+            sim_strengths[sims, idx] *= np.where(ratio > 0.85, 0.97, 1.0)
+
+        # =========================================================
+        # LAYER 6: Driver Interaction — Dynamic Rivalry (v3)
+        # =========================================================
+        # response_probability[j, k]: chance that k answers a >15% boost from j
+        if championship_data:
             # Dynamic rivalry strength from championship points gap
-            if championship_data:
-                for j in range(n_drivers):
-                    d_j = drivers[j]
-                    d_j_data = championship_data.get(d_j, {})
-                    d_j_pts = d_j_data.get('points', 0)
-                    
-                    boost_ratio = sim_strengths[j] / max(strengths[j], 1e-6)
-                    if boost_ratio > 1.15:  # >15% boost
-                        for k in range(n_drivers):
-                            if k == j:
-                                continue
-                            d_k = drivers[k]
-                            d_k_data = championship_data.get(d_k, {})
-                            d_k_pts = d_k_data.get('points', 0)
-                            
-                            # Dynamic rivalry: closer points = stronger response
-                            pts_gap = abs(d_j_pts - d_k_pts)
-                            rivalry_strength = math.exp(-pts_gap / 20.0) if pts_gap > 0 else 0.8
-                            
-                            if rivalry_strength > 0.3 and self.rng.random() < rivalry_strength:
-                                response_boost = 1.0 + (boost_ratio - 1.0) * self.rng.uniform(0.3, 0.6)
-                                sim_strengths[k] *= response_boost
-            else:
-                # Fallback: hardcoded rivalry pairs (legacy behavior)
-                RIVALRY_PAIRS = {
-                    ('VER', 'NOR'), ('NOR', 'VER'),
-                    ('HAM', 'LEC'), ('LEC', 'HAM'),
-                    ('SAI', 'NOR'), ('NOR', 'SAI'),
-                    ('RUS', 'HAM'), ('HAM', 'RUS'),
-                    ('ALO', 'VER'), ('VER', 'ALO'),
-                    ('PIA', 'NOR'), ('NOR', 'PIA'),
-                }
-                for j in range(n_drivers):
-                    d_j = drivers[j]
-                    boost_ratio = sim_strengths[j] / max(strengths[j], 1e-6)
-                    if boost_ratio > 1.15:
-                        for k in range(n_drivers):
-                            if k == j:
-                                continue
-                            d_k = drivers[k]
-                            if (d_j, d_k) in RIVALRY_PAIRS:
-                                if self.rng.random() < 0.60:
-                                    response_boost = 1.0 + (boost_ratio - 1.0) * self.rng.uniform(0.3, 0.6)
-                                    sim_strengths[k] *= response_boost
-
-            # Now sample finishing order using the modified strengths
-            # Apply chaos_burst to noise scales for clustered mode
-            sim_noise_scales = driver_noise_scales * chaos_burst
-            remaining = list(range(n_drivers))
-            order = []
-
-            for pos in range(n_drivers):
-                rem_strengths = sim_strengths[remaining]
-                total = rem_strengths.sum()
-                if total <= 0:
-                    probs = np.ones(len(remaining)) / len(remaining)
-                else:
-                    probs = rem_strengths / total
-
-                # Gumbel trick with per-driver RL-informed noise scaling
-                remaining_arr = np.array(remaining)
-                per_driver_noise = sim_noise_scales[remaining_arr]
-                noise = self.rng.gumbel(size=len(remaining)) * per_driver_noise
-                noisy_scores = np.log(probs + 1e-10) + noise
-
-                chosen_idx = np.argmax(noisy_scores)
-                chosen_driver_idx = remaining[chosen_idx]
-                order.append(chosen_driver_idx)
-                remaining.pop(chosen_idx)
-
-            # Record results
-            winner = drivers[order[0]]
-            win_counts[winner] += 1
-
-            for pos, driver_idx in enumerate(order):
-                position_counts[drivers[driver_idx]][pos + 1] += 1
+            points = np.array([championship_data.get(d, {}).get('points', 0) for d in drivers], dtype=np.float64)
+            pts_gap = np.abs(points[:, None] - points[None, :])
+            # Closer points = stronger response; rivalries below 0.3 are ignored
+            rivalry_strength = np.where(pts_gap > 0, np.exp(-pts_gap / 20.0), 0.8)
+            response_probability = np.where(rivalry_strength > 0.3, rivalry_strength, 0.0)
+        else:
+            # Fallback: hardcoded rivalry pairs (legacy behavior)
+            RIVALRY_PAIRS = {
+                ('VER', 'NOR'), ('NOR', 'VER'),
+                ('HAM', 'LEC'), ('LEC', 'HAM'),
+                ('SAI', 'NOR'), ('NOR', 'SAI'),
+                ('RUS', 'HAM'), ('HAM', 'RUS'),
+                ('ALO', 'VER'), ('VER', 'ALO'),
+                ('PIA', 'NOR'), ('NOR', 'PIA'),
+            }
+            response_probability = np.array([
+                [0.60 if (d_j, d_k) in RIVALRY_PAIRS else 0.0 for d_k in drivers]
+                for d_j in drivers
+            ])
+        np.fill_diagonal(response_probability, 0.0)
+
+        # Responses feed later boost ratios, so walk j in order
+        for j in np.flatnonzero(response_probability.any(axis=1)):
+            boost_ratio = sim_strengths[:, j] / strength_floor[j]
+            boosted = boost_ratio > 1.15  # >15% boost
+            if not boosted.any():
+                continue
+            responds = boosted[:, None] & (rng.random(shape) < response_probability[j])
+            response_boost = 1.0 + (boost_ratio[:, None] - 1.0) * rng.uniform(0.3, 0.6, size=shape)
+            sim_strengths = np.where(responds, sim_strengths * response_boost, sim_strengths)
+
+        # Now sample finishing order using the modified strengths, one grid slot at a time:
+        # Gumbel trick over the drivers still unplaced in each sim, with per-driver
+        # RL-informed noise scaling (chaos_burst applied for clustered mode)
+        sim_noise_scales = driver_noise_scales[None, :] * chaos_burst[:, None]
+        remaining = np.ones(shape, dtype=bool)
+        orders = np.empty(shape, dtype=np.intp)
+
+        for pos in range(n_drivers):
+            rem_strengths = np.where(remaining, sim_strengths, 0.0)
+            total = rem_strengths.sum(axis=1, keepdims=True)
+            probs = np.where(
+                total > 0,
+                rem_strengths / np.where(total > 0, total, 1.0),
+                1.0 / (n_drivers - pos),
+            )
+
+            noise = rng.gumbel(size=shape) * sim_noise_scales
+            noisy_scores = np.where(remaining, np.log(probs + 1e-10) + noise, -np.inf)
+
+            chosen = np.argmax(noisy_scores, axis=1)
+            orders[:, pos] = chosen
+            remaining[sims, chosen] = False
+
+        # Record results (each row of orders is a permutation, so counts never collide)
+        win_counts = np.bincount(orders[:, 0], minlength=n_drivers).astype(np.int64)
+        flat_slots = (orders * n_drivers + np.arange(n_drivers)).ravel()
+        position_counts = np.bincount(flat_slots, minlength=n_drivers * n_drivers)
+        position_counts = position_counts.reshape(n_drivers, n_drivers).astype(np.int64)
 
         # Compute distributions
-        mc_win_dist = {d: win_counts[d] / n for d in drivers}
+        mc_win_dist = {d: int(win_counts[i]) / n for i, d in enumerate(drivers)}
 
         # Predicted order: sort by average position
-        avg_positions = {}
-        for d in drivers:
-            if position_counts[d]:
-                total_pos = sum(pos * count for pos, count in position_counts[d].items())
-                total_count = sum(position_counts[d].values())
-                avg_positions[d] = total_pos / total_count
-            else:
-                avg_positions[d] = n_drivers
+        finishing_positions = np.arange(1, n_drivers + 1)
+        total_counts = position_counts.sum(axis=1)
+        total_pos = position_counts @ finishing_positions
+        avg_positions = np.where(
+            total_counts > 0,
+            total_pos / np.maximum(total_counts, 1),
+            float(n_drivers),
+        )
 
-        predicted_order = sorted(drivers, key=lambda d: avg_positions[d])
+        predicted_order = [drivers[i] for i in np.argsort(avg_positions, kind="stable")]
 
         # Position distributions + Volatility bands for ALL drivers (full P1-P20)
         pos_dists = {}
         volatility_bands = {}
-        for d in drivers:  # All drivers, not just top 5
+        for i, d in enumerate(drivers):  # All drivers, not just top 5
+            counts = position_counts[i]
             pos_dists[d] = {
-                pos: round(count / n, 3)
-                for pos, count in sorted(position_counts[d].items())
+                int(pos): round(int(counts[pos - 1]) / n, 3)
+                for pos in finishing_positions[counts > 0]
                 # No position cap — show full P1-P20 range
             }
 
-            positions = []
-            for pos, count in position_counts[d].items():
-                positions.extend([pos] * count)
-            if positions:
+            if total_counts[i]:
+                positions = np.repeat(finishing_positions, counts)
                 p10 = int(np.percentile(positions, 10))
                 p90 = int(np.percentile(positions, 90))
             else:
@@ -3,11 +3,13 @@ import joblib
 import numpy as np
 import warnings
 
-# Suppress LightGBM feature name warnings
-warnings.filterwarnings("ignore", category=UserWarning, module="sklearn")
-
-from app.models.race_state import Car, RaceState
+from app.models.race_state import Car, RaceControl, RaceState
 from app.models.strategy import PitStrategyResult
+from app.ml.encoders import PIT_TEAMS, TIRE_COMPOUNDS, PIT_ENCODERS_FILE, load_encoders
+
+# Score through the raw LightGBM booster instead of the sklearn wrapper.
+# Set PIT_NATIVE_BOOSTER=0 to fall back to predict_proba.
+USE_NATIVE_BOOSTER = os.environ.get("PIT_NATIVE_BOOSTER", "1") != "0"
 
 class PitStrategyPredictor:
     """Singleton for Pit Strategy Evaluation."""
@@ -22,18 +24,18 @@ class PitStrategyPredictor:
     def __init__(self):
         if not self.initialized:
             self.model = None
+            self.booster = None
             self.load_model()
             self.initialized = True
             
-            # Use same encoding as training
-            self.team_map = {t: i for i, t in enumerate(sorted([
-                "Red Bull Racing", "Mercedes", "Ferrari", "McLaren", "Aston Martin", 
-                "Alpine", "Williams", "RB", "Haas", "Sauber"
-            ]))}
-            
-            self.tire_map = {t: i for i, t in enumerate(sorted([
-                "SOFT", "MEDIUM", "HARD", "INTERMEDIATE", "WET"
-            ]))}
+            # Use same encoding as training (pit_encoders.json, else the defaults)
+            cur_dir = os.path.dirname(os.path.abspath(__file__))
+            encoders = load_encoders(
+                os.path.join(cur_dir, "models", PIT_ENCODERS_FILE),
+                {"team": PIT_TEAMS, "tire": TIRE_COMPOUNDS},
+            )
+            self.team_map = {t: i for i, t in enumerate(encoders["team"])}
+            self.tire_map = {t: i for i, t in enumerate(encoders["tire"])}
 
     def load_model(self):
         try:
@@ -46,12 +48,16 @@ class PitStrategyPredictor:
 
             if os.path.exists(model_path):
                 self.model = joblib.load(model_path)
+                if USE_NATIVE_BOOSTER:
+                    # Binary objective: booster.predict returns P(pit) directly
+                    self.booster = getattr(self.model, "booster_", None)
                 print("ML Pit Strategy Model loaded successfully.")
             else:
                 print("Pit Strategy Model not found. Falling back to heuristics.")
         except Exception as e:
             print(f"Failed to load Pit model: {e}")
             self.model = None
+            self.booster = None
 
     def calculate_pit_ev(self, car: Car, state: RaceState) -> PitStrategyResult:
         """
@@ -120,8 +126,8 @@ class PitStrategyPredictor:
         if self.model:
             team_code = self.team_map.get(car.identity.team, -1)
             tire_code = self.tire_map.get(car.telemetry.tire_state.compound.value, -1)
-            sc_active = 1.0 if state.race_control in ["SAFETY_CAR"] else 0.0
-            vsc_active = 1.0 if state.race_control in ["VSC"] else 0.0
+            sc_active = 1.0 if state.race_control is RaceControl.SAFETY_CAR else 0.0
+            vsc_active = 1.0 if state.race_control is RaceControl.VSC else 0.0
             
             X = np.array([[
                 float(car.timing.lap),
@@ -135,14 +141,20 @@ class PitStrategyPredictor:
                 float(car.pit_stops),
                 float(team_code)
             ]])
-            prob = self.model.predict_proba(X)[0][1]
+            if self.booster is not None:
+                prob = self.booster.predict(X)[0]
+            else:
+                # Model was fitted on a DataFrame; silence the feature-name warning here only
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", category=UserWarning)
+                    prob = self.model.predict_proba(X)[0][1]
             if prob > 0.65:
                 ev_score += 0.5 # Boost EV if ML model strongly suggests it
                 
         # SC/VSC window: dynamically scale EV boost
         # Longer stints benefit MORE from a free SC stop
-        if state.race_control in ["SAFETY_CAR", "VSC"]:
-            sc_multiplier = 1.5 if state.race_control == "SAFETY_CAR" else 0.8
+        if state.race_control is RaceControl.SAFETY_CAR or state.race_control is RaceControl.VSC:
+            sc_multiplier = 1.5 if state.race_control is RaceControl.SAFETY_CAR else 0.8
             age_bonus = min(1.5, tire_age / 15.0)  # Older tires = bigger benefit
             ev_score += sc_multiplier + age_bonus
         else:
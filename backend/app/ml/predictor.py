@@ -1,12 +1,21 @@
 
+import atexit
+import copy
 import joblib
+import lightgbm as lgb
 import numpy as np
-import pandas as pd
 import os
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
-from app.models.race_state import RaceState, RaceControl
+from app.models.race_state import CarArrays, RaceState, RaceControl
 from app.ml.monte_carlo import MonteCarloRaceSimulator
 from app.ml.rl_predictor import RLDriverPredictor
+from app.ml.feature_kernel import FEATURE_COLS, build_features
+from app.ml.encoders import (
+    DRIVERS, TEAMS, TIRE_COMPOUNDS, RACE_ENCODERS_FILE, load_encoders
+)
 from app.simulation.physics import (
     calculate_dirty_air_factor, calculate_dirty_air_mistake_effect,
     calculate_track_grip, update_rubber_level,
@@ -16,6 +25,39 @@ from app.simulation.physics import (
 # Configuration
 MODEL_DIR = "app/ml/models"
 
+# Optional fast path: rows whose first calibrated fold is at or below this
+# probability skip the remaining folds (1e-3 matches the likelihood clamp).
+# Disabled by default — the CV folds can disagree sharply on a single car,
+# so pruning on fold 0 alone changes the priors.
+PRIOR_PRUNE_THRESHOLD: Optional[float] = None
+
+# Optional fast path: resample each fold's isotonic curve onto this many evenly
+# spaced margins at load time so calibration is a single gather per row.
+# Approximate (nearest grid point instead of linear interpolation), so off by default.
+ISOTONIC_LUT_SIZE: Optional[int] = None
+
+# Reuse the last prediction while the (rounded) inputs are unchanged, forcing a
+# full recompute at least every N calls. 0 disables the cache.
+PREDICTION_CACHE_REFRESH = 10
+
+# Optional: score the CV folds on a thread pool of this size. With a single
+# 20-car grid, LightGBM's own threading already saturates and the pool only adds
+# overhead, so it is off by default; worth enabling for large batch scoring.
+PRIOR_FOLD_THREADS = 0
+
+
+def encode_labels(sorted_keys: np.ndarray, values: List[str]) -> np.ndarray:
+    """
+    Vectorized label encoding: index of each value in sorted_keys, or -1 if unknown.
+    Equivalent to {k: i for i, k in enumerate(sorted_keys)}.get(v, -1) per value.
+    """
+    values = np.asarray(values, dtype=str)
+    if len(sorted_keys) == 0 or len(values) == 0:
+        return np.full(len(values), -1, dtype=np.int64)
+    idx = np.searchsorted(sorted_keys, values)
+    idx = np.minimum(idx, len(sorted_keys) - 1)
+    return np.where(sorted_keys[idx] == values, idx, -1)
+
 class RacePredictor:
     _instance = None
 
@@ -29,47 +71,251 @@ class RacePredictor:
         if not self.initialized:
             self.win_model = None
             self.podium_model = None
+            self._win_folds = None
+            self._podium_folds = None
+            # Created on first use when PRIOR_FOLD_THREADS is set (see _fold_executor)
+            self._fold_pool = None
+            self._fold_pool_lock = threading.Lock()
             self.mc_simulator = MonteCarloRaceSimulator(n_simulations=1000)
             self.rl_predictor = RLDriverPredictor()
             self.load_models()
             self.initialized = True
+
+            # Last prediction and the inputs it was computed from (see _cache_key).
+            # The singleton serves FastAPI's threadpool, so all three are read and
+            # written under _cache_lock; _last_result is a private copy never handed out.
+            self._cache_lock = threading.Lock()
+            self._last_key = None
+            self._last_result = None
+            self._calls_since_refresh = 0
             
-            # HARDCODED ENCODERS (2025 Season)
-            # Essential because we didn't save the encoders during training.
-            # NOTE: Model was trained on 2024 codes — slight misalignment until retrained.
-            # The Bayesian modifier layers compensate for this.
-            self.driver_map = {d: i for i, d in enumerate(sorted([
-                "VER", "HAM", "LEC", "NOR", "RUS", "SAI", "ALO", "PIA",
-                "GAS", "ALB", "HUL", "OCO", "TSU", "LAW", "STR",
-                "ANT", "BEA", "DOO", "HAD", "BOR"
-            ]))}
-            
-            self.team_map = {t: i for i, t in enumerate(sorted([
-                "Red Bull Racing", "Mercedes", "Ferrari", "McLaren", "Aston Martin", 
-                "Alpine", "Williams", "Racing Bulls", "Haas", "Sauber"
-            ]))}
-            
-            self.tire_map = {t: i for i, t in enumerate(sorted([
-                "SOFT", "MEDIUM", "HARD", "INTERMEDIATE", "WET"
-            ]))}
+            # Categorical vocabularies saved by train_model.py (encoders.json);
+            # falls back to the 2025 grid constants for models trained before that.
+            # Stored as sorted arrays: code = position in the array (see encode_labels).
+            encoders = load_encoders(
+                os.path.join(self._models_dir(), RACE_ENCODERS_FILE),
+                {"driver": DRIVERS, "team": TEAMS, "tire": TIRE_COMPOUNDS},
+            )
+            self.driver_keys = np.array(encoders["driver"])
+            self.team_keys = np.array(encoders["team"])
+            self.tire_keys = np.array(encoders["tire"])
+
+    @staticmethod
+    def _models_dir() -> str:
+        cur_dir = os.path.dirname(os.path.abspath(__file__))
+        model_path = os.path.join(cur_dir, "models")
+        if not os.path.exists(model_path):
+            model_path = "app/ml/models"
+        return model_path
 
     def load_models(self):
         """Load trained models from disk (LightGBM + Calibration wrapped in joblib)"""
         try:
-            cur_dir = os.path.dirname(os.path.abspath(__file__))
-            model_path = os.path.join(cur_dir, "models") 
-            
-            if not os.path.exists(model_path):
-                model_path = "app/ml/models"
+            model_path = self._models_dir()
 
             print(f"Loading models from {model_path}...")
+
+            # Plain per-fold boosters + isotonic knots (written by train_model.py) skip unpickling
+            self._win_folds = self._load_fold_artifacts(model_path, "win_model")
+            self._podium_folds = self._load_fold_artifacts(model_path, "podium_model")
+            if self._win_folds is not None and self._podium_folds is not None:
+                self._apply_isotonic_lut()
+                print("ML Models loaded successfully (LightGBM boosters + isotonic knots).")
+                return
+
             self.win_model = joblib.load(os.path.join(model_path, "win_model.joblib"))
             self.podium_model = joblib.load(os.path.join(model_path, "podium_model.joblib"))
+            self._check_feature_names(self.win_model)
+            self._check_feature_names(self.podium_model)
+            self._win_folds = self._unwrap_calibrated(self.win_model)
+            self._podium_folds = self._unwrap_calibrated(self.podium_model)
+            self._apply_isotonic_lut()
             print("ML Models loaded successfully (LightGBM + Calibration).")
         except Exception as e:
             print(f"Failed to load ML models: {e}")
             print("Predictions will be unavailable.")
 
+    def _apply_isotonic_lut(self):
+        if ISOTONIC_LUT_SIZE:
+            self._win_folds = self._tabulate_folds(self._win_folds, ISOTONIC_LUT_SIZE)
+            self._podium_folds = self._tabulate_folds(self._podium_folds, ISOTONIC_LUT_SIZE)
+
+    @staticmethod
+    def _load_fold_artifacts(model_path: str, name: str):
+        """Load (booster, x_thresholds, y_thresholds) per fold, or None if not exported."""
+        try:
+            knots_file = np.load(os.path.join(model_path, f"{name}_isotonic.npz"))
+        except FileNotFoundError:
+            return None
+
+        folds = []
+        with knots_file as knots:
+            n_folds = sum(1 for key in knots.files if key.startswith("x_"))
+            for k in range(n_folds):
+                booster = lgb.Booster(model_file=os.path.join(model_path, f"{name}_fold{k}.txt"))
+                if booster.feature_name() != FEATURE_COLS:
+                    print(f"Warning: {name} fold {k} features do not match FEATURE_COLS.")
+                folds.append((
+                    booster,
+                    knots[f"x_{k}"].astype(np.float64),
+                    knots[f"y_{k}"].astype(np.float64),
+                ))
+        return folds or None
+
+    @staticmethod
+    def _check_feature_names(model):
+        """Validate the fitted column order once at load instead of on every predict."""
+        fitted = getattr(model, "feature_names_in_", None)
+        if fitted is not None and list(fitted) != FEATURE_COLS:
+            print(f"Warning: model features {list(fitted)} do not match FEATURE_COLS.")
+
+    @staticmethod
+    def _unwrap_calibrated(model):
+        """
+        Pull (booster, x_thresholds, y_thresholds) triples out of a binary isotonic
+        CalibratedClassifierCV so predictions skip sklearn's per-call input
+        validation. Returns None if the model has a different layout; predictions
+        then fall back to predict_proba.
+        """
+        try:
+            folds = []
+            for calibrated in model.calibrated_classifiers_:
+                if len(calibrated.classes) != 2 or len(calibrated.calibrators) != 1:
+                    return None
+                if calibrated.method != "isotonic":
+                    return None
+                iso = calibrated.calibrators[0]
+                if iso.out_of_bounds != "clip":
+                    return None
+                folds.append((
+                    calibrated.estimator.booster_,
+                    np.asarray(iso.X_thresholds_, dtype=np.float64),
+                    np.asarray(iso.y_thresholds_, dtype=np.float64),
+                ))
+            return folds or None
+        except AttributeError:
+            return None
+
+    @staticmethod
+    def _tabulate_folds(folds, size: int):
+        """Append a (x0, 1/step, table) isotonic lookup table to each fold triple."""
+        if folds is None:
+            return None
+        tabulated = []
+        for booster, x_thr, y_thr in folds:
+            x0, x1 = x_thr[0], x_thr[-1]
+            grid = np.linspace(x0, x1, size)
+            inv_step = (size - 1) / (x1 - x0) if x1 > x0 else 0.0
+            tabulated.append((booster, x_thr, y_thr, (x0, inv_step, np.interp(grid, x_thr, y_thr))))
+        return tabulated
+
+    @staticmethod
+    def _fold_prob(fold, rows: np.ndarray) -> np.ndarray:
+        """Calibrated P(class 1) from a single CV fold."""
+        booster, x_thr, y_thr = fold[:3]
+        margin = booster.predict(rows, raw_score=True)
+        if len(fold) == 4:
+            x0, inv_step, table = fold[3]
+            idx = np.rint((margin - x0) * inv_step)
+            return table[np.clip(idx, 0, len(table) - 1).astype(np.intp)]
+        # np.interp clamps to the end values, matching out_of_bounds='clip'
+        return np.interp(margin, x_thr, y_thr)
+
+    @staticmethod
+    def _predict_folds(folds, X: np.ndarray) -> np.ndarray:
+        """
+        P(class 1) per row: mean over folds of isotonic(raw booster margin).
+
+        With PRIOR_PRUNE_THRESHOLD set, rows the first fold puts at or below it
+        keep that value and the remaining folds only score the rest of the grid.
+        """
+        fold_prob = RacePredictor._fold_prob
+        prob = fold_prob(folds[0], X)
+        if len(folds) == 1:
+            return prob
+
+        if PRIOR_PRUNE_THRESHOLD is None:
+            for fold in folds[1:]:
+                prob += fold_prob(fold, X)
+            prob /= len(folds)
+            return prob
+
+        live = prob > PRIOR_PRUNE_THRESHOLD
+        if not live.any():
+            return prob
+
+        rows = X[live]
+        live_prob = prob[live]
+        for fold in folds[1:]:
+            live_prob += fold_prob(fold, rows)
+        prob[live] = live_prob / len(folds)
+        return prob
+
+    @property
+    def models_loaded(self) -> bool:
+        win_ready = self._win_folds is not None or self.win_model is not None
+        podium_ready = self._podium_folds is not None or self.podium_model is not None
+        return win_ready and podium_ready
+
+    def _fold_executor(self) -> ThreadPoolExecutor:
+        """The fold pool, started once on first use and shut down at interpreter exit."""
+        with self._fold_pool_lock:
+            if self._fold_pool is None:
+                self._fold_pool = ThreadPoolExecutor(
+                    max_workers=PRIOR_FOLD_THREADS, thread_name_prefix="prior-fold")
+                atexit.register(self._fold_pool.shutdown, wait=False)
+            return self._fold_pool
+
+    def _predict_folds_threaded(self, X: np.ndarray):
+        """Score every win and podium fold concurrently (LightGBM releases the GIL)."""
+        folds = self._win_folds + self._podium_folds
+        probs = list(self._fold_executor().map(lambda fold: self._fold_prob(fold, X), folds))
+        n_win = len(self._win_folds)
+        return np.mean(probs[:n_win], axis=0), np.mean(probs[n_win:], axis=0)
+
+    def _predict_priors(self, X: np.ndarray):
+        """Win and podium priors for the same feature matrix in one pass."""
+        if self._win_folds is not None and self._podium_folds is not None:
+            if PRIOR_FOLD_THREADS and PRIOR_PRUNE_THRESHOLD is None:
+                return self._predict_folds_threaded(X)
+            return self._predict_folds(self._win_folds, X), self._predict_folds(self._podium_folds, X)
+
+        # Models were fitted on a DataFrame; the bare ndarray only trips the feature-name warning
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=UserWarning)
+            return self.win_model.predict_proba(X)[:, 1], self.podium_model.predict_proba(X)[:, 1]
+
+    @staticmethod
+    def _rl_personality(driver_cfg) -> Dict[str, float]:
+        """RL policy personality traits from a scenario driver config (neutral if absent)."""
+        if not driver_cfg:
+            return {'aggression': 0.5, 'consistency': 0.5, 'wet_skill': 0.5, 'tire_management': 0.5, 'risk_tolerance': 0.5}
+        return {
+            'aggression': getattr(driver_cfg, 'aggression', 0.5),
+            'consistency': 1.0 - getattr(driver_cfg, 'radio_emotionality', 0.5) * 0.5,
+            'wet_skill': getattr(driver_cfg, 'wet_weather_skill', 0.5),
+            'tire_management': getattr(driver_cfg, 'tire_preservation', 0.5),
+            'risk_tolerance': getattr(driver_cfg, 'risk_tolerance', 0.5),
+        }
+
+    @staticmethod
+    def _cache_key(state: RaceState, arrays: CarArrays, X: np.ndarray, scenario_config) -> tuple:
+        """
+        Everything predict() depends on, rounded to 0.1 for the fast-moving
+        telemetry so sub-tick jitter doesn't force a recompute.
+        """
+        track = state.track
+        return (
+            np.rint(X * 10.0).astype(np.int32).tobytes(),
+            np.isnan(arrays.interval).tobytes(),
+            np.rint(arrays.driver_skill * 1000.0).astype(np.int32).tobytes(),
+            np.rint(arrays.momentum * 100.0).astype(np.int32).tobytes(),
+            tuple(arrays.driver),
+            (track.id, track.length, track.sc_probability,
+             track.track_evolution.model_dump_json() if track.track_evolution else None),
+            scenario_config.model_dump_json() if scenario_config is not None else None,
+        )
+
     def predict(self, state: RaceState, scenario_config=None) -> Dict:
         """
         Bayesian Prediction Pipeline:
@@ -79,58 +325,50 @@ class RacePredictor:
         All scenario modifiers operate in log-odds (logit) space for clean
         mathematical composition. Probabilities are recovered via sigmoid.
         """
-        if not self.win_model or not self.podium_model:
+        if not self.models_loaded:
             return None
 
-        data = []
         total_laps = state.meta.laps_total
-        
-        for car in state.cars:
-            gap_leader = car.timing.gap_to_leader if car.timing.gap_to_leader is not None else 0.0
-            gap_ahead = car.timing.interval if car.timing.interval is not None else 0.0
-            
-            driver_code = self.driver_map.get(car.identity.driver, -1)
-            team_code = self.team_map.get(car.identity.team, -1)
-            tire_code = self.tire_map.get(car.telemetry.tire_state.compound.value, -1)
-            
-            row = {
-                "lap": car.timing.lap,
-                "lap_progress": car.telemetry.lap_progress,
-                "laps_remaining": total_laps - car.timing.lap,
-                "position": car.timing.position,
-                "speed": car.telemetry.speed,
-                "gap_to_leader": gap_leader,
-                "gap_to_car_ahead": gap_ahead,
-                "tire_age": car.telemetry.tire_state.age,
-                "tire_wear": car.telemetry.tire_state.wear,
-                "pit_stops": car.pit_stops,
-                "sc_active": 1 if state.race_control == RaceControl.SAFETY_CAR else 0,
-                "vsc_active": 1 if state.race_control == RaceControl.VSC else 0,
-                "drs_enabled": 1 if state.drs_enabled else 0,
-                "tire_compound_code": tire_code, 
-                "team_code": team_code,
-                "driver_code": driver_code
-            }
-            data.append(row)
-
-        df = pd.DataFrame(data)
-        
-        # Column order MUST match training
-        feature_cols = [
-            "lap", "lap_progress", "laps_remaining", "position",
-            "speed", "gap_to_leader", "gap_to_car_ahead",
-            "tire_age", "tire_wear", "pit_stops",
-            "sc_active", "vsc_active", "drs_enabled",
-            "tire_compound_code", "team_code", "driver_code"
-        ]
-        
-        X = df[feature_cols]
+        n_cars = len(state.cars)
+        # Per call: the singleton serves concurrent requests from FastAPI's threadpool.
+        # float64 so LightGBM sees the exact split inputs.
+        X = np.empty((n_cars, len(FEATURE_COLS)), dtype=np.float64)
+
+        cars = state.cars
+        arrays = state.arrays
+
+        # Vectorized fill in FEATURE_COLS order from the SoA view
+        build_features(
+            arrays, total_laps,
+            sc_active=state.race_control is RaceControl.SAFETY_CAR,
+            vsc_active=state.race_control is RaceControl.VSC,
+            drs_enabled=state.drs_enabled,
+            tire_codes=encode_labels(self.tire_keys, arrays.tire_compound),
+            team_codes=encode_labels(self.team_keys, arrays.team),
+            driver_codes=encode_labels(self.driver_keys, arrays.driver),
+            out=X,
+        )
+
+        cache_key = None
+        if PREDICTION_CACHE_REFRESH:
+            cache_key = self._cache_key(state, arrays, X, scenario_config)
+            with self._cache_lock:
+                cached = None
+                if (cache_key == self._last_key
+                        and self._calls_since_refresh < PREDICTION_CACHE_REFRESH):
+                    self._calls_since_refresh += 1
+                    cached = self._last_result
+            if cached is not None:
+                # Deep copy: callers may mutate the nested per-driver dicts
+                results = copy.deepcopy(cached)
+                results["lap"] = state.cars[0].timing.lap
+                results["confidence"] = min(1.0, state.meta.tick / (total_laps * 300))
+                return results
 
         # =================================================================
         # STAGE 1: PRIOR — LightGBM Calibrated Probabilities
         # =================================================================
-        win_probs_raw = self.win_model.predict_proba(X)
-        podium_probs_raw = self.podium_model.predict_proba(X)
+        win_probs_raw, podium_probs_raw = self._predict_priors(X)
         
         # Extract scenario-level parameters
         chaos_multiplier = 1.0
@@ -166,10 +404,26 @@ class RacePredictor:
         podium_prob_dict = {}
         causal_factors = {}
         rl_signals_dict = {}  # Flows to Monte Carlo for per-driver noise
+        drivers_cfg = scenario_config.drivers if scenario_config else {}
+        
+        # Environment variance is shared by every car (feeds the chaos term)
+        env_variance = max(0.0, (chaos_multiplier - 1.0) * 0.5 + (sc_multiplier - 1.0) * 0.3 + rain_probability * 0.4)
+        
+        # RL lap simulation for the whole grid in one batched rollout
+        rl_batch = self.rl_predictor.simulate_lap_performance_batch(
+            track_length=state.track.length,
+            driver_skills=arrays.driver_skill.tolist(),
+            personalities=[self._rl_personality(drivers_cfg.get(d)) for d in arrays.driver],
+        )
         
-        for i, car in enumerate(state.cars):
-            p_win = float(win_probs_raw[i][1]) if len(win_probs_raw[i]) > 1 else 0.0
-            p_podium = float(podium_probs_raw[i][1]) if len(podium_probs_raw[i]) > 1 else 0.0
+        tire_ages = arrays.tire_age.tolist()
+        for i, car in enumerate(cars):
+            driver = arrays.driver[i]
+            timing = car.timing
+            driver_cfg = drivers_cfg.get(driver)
+            
+            p_win = float(win_probs_raw[i])
+            p_podium = float(podium_probs_raw[i])
             
             raw_p_win = p_win  # Store for surprise index
             
@@ -182,11 +436,10 @@ class RacePredictor:
             logit_podium = np.log(p_podium / (1.0 - p_podium))
             
             # --- Chaos term: pulls probabilities toward 50% (logit → 0) ---
-            env_variance = max(0.0, (chaos_multiplier - 1.0) * 0.5 + (sc_multiplier - 1.0) * 0.3 + rain_probability * 0.4)
             chaos_term = -(env_variance * 0.8) * np.sign(logit_win) * min(1.0, abs(logit_win))
             
             # --- Tire degradation term ---
-            tire_age = car.telemetry.tire_state.age
+            tire_age = tire_ages[i]
             tire_term = 0.0
             if tire_deg_multiplier > 1.0 and tire_age > 8:
                 deg_penalty = max(0.3, 1.0 - ((tire_deg_multiplier - 1.0) * 0.15 * (tire_age / 15.0)))
@@ -199,10 +452,8 @@ class RacePredictor:
             rain_term = 0.0
             if rain_probability > 0.3:
                 wet_skill = 0.5
-                if scenario_config:
-                    driver_cfg = scenario_config.drivers.get(car.identity.driver)
-                    if driver_cfg:
-                        wet_skill = getattr(driver_cfg, 'wet_weather_skill', 0.5)
+                if driver_cfg:
+                    wet_skill = getattr(driver_cfg, 'wet_weather_skill', 0.5)
                 rain_modifier = 1.0 + (wet_skill - 0.5) * rain_probability * 0.6
                 rain_term = np.log(max(0.3, rain_modifier))
                 
@@ -211,24 +462,8 @@ class RacePredictor:
             skill_term = 0.3 * np.log(skill_bonus)
             
             # --- RL term: Personality-driven behavioral signal ---
-            personality = {'aggression': 0.5, 'consistency': 0.5, 'wet_skill': 0.5, 'tire_management': 0.5, 'risk_tolerance': 0.5}
-            if scenario_config:
-                driver_cfg = scenario_config.drivers.get(car.identity.driver)
-                if driver_cfg:
-                    personality = {
-                        'aggression': getattr(driver_cfg, 'aggression', 0.5),
-                        'consistency': 1.0 - getattr(driver_cfg, 'radio_emotionality', 0.5) * 0.5,
-                        'wet_skill': getattr(driver_cfg, 'wet_weather_skill', 0.5),
-                        'tire_management': getattr(driver_cfg, 'tire_preservation', 0.5),
-                        'risk_tolerance': getattr(driver_cfg, 'risk_tolerance', 0.5),
-                    }
-            
-            rl_signals = self.rl_predictor.simulate_lap_performance(
-                track_length=state.track.length,
-                driver_skill=car.driver_skill,
-                personality=personality
-            )
-            rl_signals_dict[car.identity.driver] = rl_signals
+            rl_signals = rl_batch[i]
+            rl_signals_dict[driver] = rl_signals
             
             rl_bonus = 1.0 / rl_signals["time_modifier"]
             rl_term = np.log(max(0.5, rl_bonus))
@@ -238,12 +473,12 @@ class RacePredictor:
             if qualifying_delta != 0.0:
                 # Front-runners (low position) get boosted, back-markers get penalized
                 # Scale by inverse position: P1 gets full effect, P20 gets 1/20th
-                position_factor = max(0.05, 1.0 - (car.timing.position - 1) / 20.0)
+                position_factor = max(0.05, 1.0 - (timing.position - 1) / 20.0)
                 quali_term = qualifying_delta * position_factor * 0.5  # damped
             
             # --- Dirty air term: penalize drivers stuck following closely ---
             dirty_air_term = 0.0
-            gap_ahead = car.timing.interval if car.timing.interval is not None else 99.0
+            gap_ahead = timing.interval if timing.interval is not None else 99.0
             da_factor = calculate_dirty_air_factor(gap_ahead)
             if da_factor > 0.05:
                 # Dirty air hurts your chances
@@ -254,8 +489,8 @@ class RacePredictor:
             if hasattr(state.track, 'track_evolution') and state.track.track_evolution:
                 te = state.track.track_evolution
                 # Simulate grip at current lap based on rubber buildup
-                race_progress = car.timing.lap / max(1, state.meta.laps_total)
-                sim_rubber = te.rubber_level + te.rubber_buildup_rate * car.timing.lap * (len(state.cars) / 20.0)
+                race_progress = timing.lap / max(1, state.meta.laps_total)
+                sim_rubber = te.rubber_level + te.rubber_buildup_rate * timing.lap * (len(cars) / 20.0)
                 sim_grip = calculate_track_grip(te.grip_level, sim_rubber)
                 if sim_grip > 1.02:
                     track_grip_term = np.log(1.0 + (sim_grip - 1.0) * 0.05)  # Subtle boost
@@ -270,20 +505,18 @@ class RacePredictor:
             
             # --- Championship pressure term ---
             championship_term = 0.0
-            if scenario_config:
-                driver_cfg = scenario_config.drivers.get(car.identity.driver)
-                if driver_cfg:
-                    champ_pos = getattr(driver_cfg, 'championship_position', 0)
-                    champ_pts = getattr(driver_cfg, 'championship_points', 0)
-                    if champ_pos > 0:
-                        pressure_handling = getattr(driver_cfg, 'pressure_handling', 1.0)
-                        if champ_pos <= 3:  # Title contender
-                            # Leaders are conservative (slightly penalized for risk aversion)
-                            # Chasers are aggressive (boosted but mistake-prone)
-                            if champ_pos == 1:
-                                championship_term = -0.05 * (2.0 - pressure_handling)  # Conservative penalty
-                            else:
-                                championship_term = 0.08 * pressure_handling  # Aggressive boost
+            if driver_cfg:
+                champ_pos = getattr(driver_cfg, 'championship_position', 0)
+                champ_pts = getattr(driver_cfg, 'championship_points', 0)
+                if champ_pos > 0:
+                    pressure_handling = getattr(driver_cfg, 'pressure_handling', 1.0)
+                    if champ_pos <= 3:  # Title contender
+                        # Leaders are conservative (slightly penalized for risk aversion)
+                        # Chasers are aggressive (boosted but mistake-prone)
+                        if champ_pos == 1:
+                            championship_term = -0.05 * (2.0 - pressure_handling)  # Conservative penalty
+                        else:
+                            championship_term = 0.08 * pressure_handling  # Aggressive boost
             
             # =================================================================
             # COMPOSE: logit(posterior) = logit(prior) + Σ likelihood terms
@@ -353,11 +586,11 @@ class RacePredictor:
             elif championship_term < 0:
                 factors.append("Championship Leader Caution")
                 
-            factors.append(f"Track Pos: P{car.timing.position}")
-            causal_factors[car.identity.driver] = factors
+            factors.append(f"Track Pos: P{timing.position}")
+            causal_factors[driver] = factors
             
-            win_prob_dict[car.identity.driver] = p_win
-            podium_prob_dict[car.identity.driver] = p_podium
+            win_prob_dict[driver] = p_win
+            podium_prob_dict[driver] = p_podium
 
         # =================================================================
         # STAGE 3: POSTERIOR PREPARATION — Temperature Softmax + Dirichlet
@@ -478,5 +711,12 @@ class RacePredictor:
             "volatility_bands": mc_results.get("volatility_bands", {}),
             "causal_factors": causal_factors
         }
+
+        if cache_key is not None:
+            snapshot = copy.deepcopy(results)
+            with self._cache_lock:
+                self._last_key = cache_key
+                self._last_result = snapshot
+                self._calls_since_refresh = 0
             
         return results
\ No newline at end of file
@@ -1,6 +1,51 @@
 import os
+import json
 import numpy as np
+import torch as th
 from stable_baselines3 import PPO
+from stable_baselines3.common.policies import ActorCriticPolicy
+
+# Observation slots 4-8: fixed LiDAR ray placeholders (no spatial sensing at inference)
+LIDAR_PLACEHOLDER = (20.0, 20.0, 30.0, 20.0, 20.0)
+
+
+class _DeterministicActor(th.nn.Module):
+    """Inference-only PPO actor: obs -> clipped mean action (SB3 deterministic predict)."""
+
+    def __init__(self, policy):
+        super().__init__()
+        self.features_extractor = policy.pi_features_extractor
+        self.policy_net = policy.mlp_extractor.policy_net
+        self.action_net = policy.action_net
+        self.register_buffer("low", th.as_tensor(policy.action_space.low, dtype=th.float32))
+        self.register_buffer("high", th.as_tensor(policy.action_space.high, dtype=th.float32))
+
+    def forward(self, obs):
+        latent_pi = self.policy_net(self.features_extractor(obs))
+        return th.clamp(self.action_net(latent_pi), self.low, self.high)
+
+
+def export_deterministic_actor(model: PPO, path: str) -> str:
+    """
+    Trace the deterministic actor of a trained PPO model to TorchScript.
+    RLDriverPredictor loads `<name>.pt` in preference to the SB3 zip.
+    """
+    policy = model.policy.to("cpu").eval()
+    obs_dim = int(model.observation_space.shape[0])
+    with th.no_grad():
+        scripted = th.jit.trace(_DeterministicActor(policy), th.zeros(1, obs_dim))
+    th.jit.save(scripted, path, _extra_files={"meta.json": json.dumps({"obs_dim": obs_dim})})
+    return path
+
+
+def export_policy_weights(model: PPO, path: str) -> str:
+    """
+    Save only the PPO policy (weights + constructor args) via SB3's policy.save.
+    RLDriverPredictor loads `<name>.policy.pth` when no TorchScript actor exists,
+    skipping the zip archive and full algorithm reconstruction.
+    """
+    model.policy.to("cpu").save(path)
+    return path
 
 class RLDriverPredictor:
     """Singleton to load and serve PPO actions for Car telemetry"""
@@ -17,6 +62,8 @@ class RLDriverPredictor:
             return
             
         self.model = None
+        self.actor = None
+        self.obs_dim = 14
         self.load_model()
         self.initialized = True
 
@@ -28,14 +75,91 @@ class RLDriverPredictor:
             if not os.path.exists(model_path):
                 model_path = "app/ml/models/ppo_f1_driver_2025_2026.zip"
 
-            if os.path.exists(model_path):
+            # Prefer the exported TorchScript actor (no SB3 predict overhead)
+            actor_path = model_path[:-len(".zip")] + ".pt"
+            policy_path = model_path[:-len(".zip")] + ".policy.pth"
+            if os.path.exists(actor_path):
+                extra_files = {"meta.json": ""}
+                self.actor = th.jit.load(actor_path, map_location="cpu", _extra_files=extra_files)
+                self.obs_dim = json.loads(extra_files["meta.json"])["obs_dim"]
+                print("RL Spatial Driver Model loaded successfully (TorchScript).")
+            elif os.path.exists(policy_path):
+                policy = ActorCriticPolicy.load(policy_path, device="cpu").eval()
+                self.actor = _DeterministicActor(policy).eval()
+                self.obs_dim = int(policy.observation_space.shape[0])
+                print("RL Spatial Driver Model loaded successfully (policy weights).")
+            elif os.path.exists(model_path):
                 self.model = PPO.load(model_path)
+                # Detect model observation dimension once (14D legacy, 17D v2)
+                try:
+                    self.obs_dim = self.model.observation_space.shape[0]
+                except Exception:
+                    self.obs_dim = 14  # legacy default
                 print("RL Spatial Driver Model loaded successfully.")
             else:
                 print("RL Driver Model not found.")
         except Exception as e:
             print(f"Failed to load RL model: {e}")
             self.model = None
+            self.actor = None
+
+        # Observation width: 14D base, 17D with the v2 signals
+        self._obs_width = 17 if self.obs_dim >= 17 else 14
+
+    @property
+    def available(self) -> bool:
+        return self.model is not None or self.actor is not None
+
+    def _act(self, obs: np.ndarray) -> np.ndarray:
+        """Deterministic actions for one observation or a batch of them."""
+        if self.actor is not None:
+            if obs.shape[-1] != self.obs_dim:
+                raise ValueError(f"Unexpected observation shape {obs.shape} for actor with obs_dim={self.obs_dim}")
+            with th.no_grad():
+                actions = self.actor(th.from_numpy(np.atleast_2d(obs))).numpy()
+            return actions[0] if obs.ndim == 1 else actions
+        actions, _states = self.model.predict(obs, deterministic=True)
+        return actions
+
+    def predict_actions_batch(self, speeds, xs, ys, headings, personalities,
+                              dirty_air=0.0, momentum=0.0, track_grip=1.0):
+        """
+        Batched predict_action: one policy call for N cars.
+
+        speeds/xs/ys/headings and the optional v2 signals are scalars or length-N
+        arrays; personalities is a list of N trait dicts.
+        Returns (steering, throttle, brake) as length-N float32 arrays.
+        """
+        n = len(personalities)
+        if not self.available:
+            return np.zeros(n, dtype=np.float32), np.full(n, 0.5, dtype=np.float32), np.zeros(n, dtype=np.float32)
+
+        # Built per call: the singleton serves concurrent requests
+        obs = np.zeros((n, self._obs_width), dtype=np.float32)
+        obs[:, 4:9] = LIDAR_PLACEHOLDER
+        obs[:, 0] = speeds
+        obs[:, 1] = xs
+        obs[:, 2] = ys
+        obs[:, 3] = headings
+        obs[:, 9:14] = [
+            (p.get('aggression', 0.5), p.get('consistency', 0.5), p.get('wet_skill', 0.5),
+             p.get('tire_management', 0.5), p.get('risk_tolerance', 0.5))
+            for p in personalities
+        ]
+        if self.obs_dim >= 17:
+            obs[:, 14] = dirty_air
+            obs[:, 15] = momentum
+            obs[:, 16] = track_grip
+
+        try:
+            actions = self._act(obs)
+        except ValueError as e:
+            if "Unexpected observation shape" in str(e):
+                print(f"[RL Predictor] Warning: Model expects old geometry. Error: {e}")
+                return np.zeros(n, dtype=np.float32), np.full(n, 0.5, dtype=np.float32), np.zeros(n, dtype=np.float32)
+            raise e
+        # Actions are [steering, throttle, brake] per row
+        return actions[:, 0], actions[:, 1], actions[:, 2]
 
     def predict_action(self, speed_kmh, x, y, heading, personality=None,
                        dirty_air_factor=0.0, momentum=0.0, track_grip=1.0):
@@ -43,41 +167,31 @@ class RLDriverPredictor:
         Takes current vehicle state and returns (steering, throttle, brake)
         Supports both 14D (legacy) and 17D (v2) observation spaces.
         """
-        if not self.model:
+        if not self.available:
             return 0.0, 0.5, 0.0 # Default fallback: go straight slowly
             
         if personality is None:
             personality = {'aggression': 0.5, 'consistency': 0.5, 'wet_skill': 0.5, 'tire_management': 0.5, 'risk_tolerance': 0.5}
 
-        # Detect model observation dimension for backward compatibility
-        try:
-            expected_obs_dim = self.model.observation_space.shape[0]
-        except Exception:
-            expected_obs_dim = 14  # legacy default
-        
-        # Build base observation (14D)
-        base_obs = [
-            speed_kmh, x, y, heading,
-            20.0, 20.0, 30.0, 20.0, 20.0,  # LiDAR rays
-            personality.get('aggression', 0.5),
-            personality.get('consistency', 0.5),
-            personality.get('wet_skill', 0.5),
-            personality.get('tire_management', 0.5),
-            personality.get('risk_tolerance', 0.5)
-        ]
-        
-        # Add v2 signals if model supports 17D
-        if expected_obs_dim >= 17:
-            base_obs.extend([
-                float(dirty_air_factor),
-                float(momentum),
-                float(track_grip),
-            ])
-        
-        obs = np.array(base_obs, dtype=np.float32)
+        # Built per call: the singleton serves concurrent requests
+        obs = np.zeros(self._obs_width, dtype=np.float32)
+        obs[4:9] = LIDAR_PLACEHOLDER
+        obs[0] = speed_kmh
+        obs[1] = x
+        obs[2] = y
+        obs[3] = heading
+        obs[9] = personality.get('aggression', 0.5)
+        obs[10] = personality.get('consistency', 0.5)
+        obs[11] = personality.get('wet_skill', 0.5)
+        obs[12] = personality.get('tire_management', 0.5)
+        obs[13] = personality.get('risk_tolerance', 0.5)
+        if self.obs_dim >= 17:
+            obs[14] = dirty_air_factor
+            obs[15] = momentum
+            obs[16] = track_grip
 
         try:
-            action, _states = self.model.predict(obs, deterministic=True)
+            action = self._act(obs)
             # Action is [steering, throttle, brake]
             return action[0], action[1], action[2]
         except ValueError as e:
@@ -98,7 +212,7 @@ class RLDriverPredictor:
                 wear_modifier: float — tire stress ratio vs baseline
                 mistake_probability: float — fraction of ticks with extreme inputs
         """
-        if not self.model:
+        if not self.available:
             # Fallback scaling if model isn't trained yet
             return {
                 "time_modifier": 1.0,
@@ -200,3 +314,91 @@ class RLDriverPredictor:
             "wear_modifier": max(0.7, min(1.5, wear_modifier)),
             "mistake_probability": mistake_probability
         }
+
+    def simulate_lap_performance_batch(self, track_length=5000, base_speed=250.0, driver_skills=None, personalities=None):
+        """
+        simulate_lap_performance for a whole grid in lockstep: every tick makes
+        one batched policy call for the cars still on their lap.
+
+        driver_skills and personalities are per-car lists; returns a list of
+        signal dicts in the same order (see simulate_lap_performance).
+        """
+        n = len(personalities)
+        if not self.available or n == 0:
+            return [self.simulate_lap_performance(track_length, base_speed) for _ in range(n)]
+
+        default_personality = {'aggression': 0.5, 'consistency': 0.5, 'wet_skill': 0.5, 'tire_management': 0.5, 'risk_tolerance': 0.5}
+        personalities = [p if p is not None else default_personality for p in personalities]
+        skills = np.asarray(driver_skills if driver_skills is not None else [0.9] * n, dtype=np.float64)
+
+        # Float32 state mirrors the scalar loop, where policy outputs promote speeds to float32
+        aggressive = np.array([p['aggression'] > 0.8 for p in personalities])
+        tire_health_factor = np.array([2.0 - p.get('tire_management', 0.5) for p in personalities], dtype=np.float32)
+        speed = np.full(n, 100.0, dtype=np.float32)
+        distance = np.zeros(n, dtype=np.float32)
+        time_elapsed = np.zeros(n, dtype=np.float64)
+        accumulated_stress = np.zeros(n, dtype=np.float32)
+        extreme_input_ticks = np.zeros(n, dtype=np.int64)
+        steps = np.zeros(n, dtype=np.int64)
+
+        tick_s = 0.1
+        max_steps = 2000
+        speed_samples = np.empty((max_steps, n), dtype=np.float32)
+
+        active = np.arange(n)
+        for step in range(max_steps):
+            active = active[distance[active] < track_length]
+            if active.size == 0:
+                break
+
+            lap_progress = distance[active] / max(1.0, track_length)
+            track_grip = np.minimum(1.15, 1.0 + lap_progress * 0.04)
+
+            steering, throttle, brake = self.predict_actions_batch(
+                speed[active], 0.0, 0.0, 0.0, [personalities[i] for i in active],
+                dirty_air=0.0, momentum=0.0, track_grip=track_grip,
+            )
+
+            accel = (throttle * 10.0 * skills[active].astype(np.float32)) - (brake * 15.0)
+            accel = np.where(aggressive[active], accel * np.float32(1.1), accel)
+
+            new_speed = np.clip(speed[active] + accel, 30.0, 350.0).astype(np.float32)
+            speed[active] = new_speed
+            speed_samples[step, active] = new_speed
+
+            distance[active] += new_speed / np.float32(3.6) * np.float32(tick_s)
+            time_elapsed[active] += tick_s
+
+            accumulated_stress[active] += (np.abs(steering) + throttle + brake) * tire_health_factor[active] * np.float32(tick_s)
+
+            extreme_input_ticks[active] += (brake > 0.85) | (np.abs(steering) > 0.75)
+            steps[active] += 1
+
+        expected_time = (track_length / (base_speed / 3.6))
+        expected_stress = expected_time * 0.35
+        results = []
+        for i in range(n):
+            samples = speed_samples[:steps[i], i].astype(np.float64) if steps[i] else np.array([base_speed])
+            time_variance = float(np.std(samples) / base_speed)
+            time_modifier = float(time_elapsed[i]) / expected_time
+            wear_modifier = float(accumulated_stress[i]) / expected_stress
+            mistake_probability = (int(extreme_input_ticks[i]) / max(1, int(steps[i]))) * (0.5 + personalities[i].get('aggression', 0.5))
+            mistake_probability = max(0.005, min(0.08, mistake_probability))
+            results.append({
+                "time_modifier": max(0.8, min(1.2, time_modifier)),
+                "time_variance": max(0.0, min(0.5, time_variance)),
+                "wear_modifier": max(0.7, min(1.5, wear_modifier)),
+                "mistake_probability": mistake_probability
+            })
+        return results
+
+
+if __name__ == "__main__":
+    # Export the shipped SB3 model for serving: python -m app.ml.rl_predictor
+    cur_dir = os.path.dirname(os.path.abspath(__file__))
+    zip_path = os.path.join(cur_dir, "models", "ppo_f1_driver_2025_2026.zip")
+    ppo = PPO.load(zip_path, device="cpu")
+    out = export_deterministic_actor(ppo, zip_path[:-len(".zip")] + ".pt")
+    print(f"TorchScript actor saved to {out}")
+    out = export_policy_weights(ppo, zip_path[:-len(".zip")] + ".policy.pth")
+    print(f"Policy weights saved to {out}")
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import joblib
 import os
@@ -6,10 +7,25 @@ from sklearn.calibration import CalibratedClassifierCV
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, log_loss, brier_score_loss, classification_report
 
+from app.ml.encoders import DRIVERS, TEAMS, TIRE_COMPOUNDS, RACE_ENCODERS_FILE, save_encoders
+
 # Configuration
 DATA_PATH = "app/ml/data/synthetic_race_data.csv"
 MODEL_DIR = "app/ml/models"
 
+def export_calibrated_folds(model, name, model_dir=MODEL_DIR):
+    """
+    Write a fitted CalibratedClassifierCV as plain artifacts for pickle-free serving:
+    one LightGBM text model per CV fold plus the isotonic knots in a single npz.
+    """
+    knots = {}
+    for k, calibrated in enumerate(model.calibrated_classifiers_):
+        calibrated.estimator.booster_.save_model(os.path.join(model_dir, f"{name}_fold{k}.txt"))
+        iso = calibrated.calibrators[0]
+        knots[f"x_{k}"] = iso.X_thresholds_
+        knots[f"y_{k}"] = iso.y_thresholds_
+    np.savez(os.path.join(model_dir, f"{name}_isotonic.npz"), **knots)
+
 def train_models():
     print("Loading data...")
     if os.path.exists(DATA_PATH):
@@ -27,31 +43,22 @@ def train_models():
         "sc_active", "vsc_active", "drs_enabled"
     ]
     
-    # Encode categorical features strictly using the 2025 Predictor maps
+    # Encode categorical features strictly using the 2025 Predictor vocabularies
     # This prevents misalignment if the training data contains older drivers 
     # (e.g. 2024 drivers like Sargeant or Magnussen).
+    # Unknown labels get code -1 (LightGBM treats negative categories as missing).
+    # int8 codes, added in a single assign so the frame is only rebuilt once.
+    encoders = {"tire": TIRE_COMPOUNDS, "team": TEAMS, "driver": DRIVERS}
+    # get_indexer maps unknown labels to -1 itself (Categorical with values outside
+    # its categories is deprecated in pandas).
+    df = df.assign(
+        tire_compound_code=pd.Index(encoders["tire"]).get_indexer(df['tire_compound']).astype(np.int8),
+        team_code=pd.Index(encoders["team"]).get_indexer(df['team']).astype(np.int8),
+        driver_code=pd.Index(encoders["driver"]).get_indexer(df['driver']).astype(np.int8),
+    )
     
-    driver_map = {d: i for i, d in enumerate(sorted([
-        "VER", "HAM", "LEC", "NOR", "RUS", "SAI", "ALO", "PIA",
-        "GAS", "ALB", "HUL", "OCO", "TSU", "LAW", "STR",
-        "ANT", "BEA", "DOO", "HAD", "BOR"
-    ]))}
-    
-    team_map = {t: i for i, t in enumerate(sorted([
-        "Red Bull Racing", "Mercedes", "Ferrari", "McLaren", "Aston Martin", 
-        "Alpine", "Williams", "Racing Bulls", "Haas", "Sauber"
-    ]))}
-    
-    tire_map = {t: i for i, t in enumerate(sorted([
-        "SOFT", "MEDIUM", "HARD", "INTERMEDIATE", "WET"
-    ]))}
-
-    # Map directly, filling uknowns with -1
-    df['tire_compound_code'] = df['tire_compound'].map(tire_map).fillna(-1).astype(int)
-    df['team_code'] = df['team'].map(team_map).fillna(-1).astype(int)
-    df['driver_code'] = df['driver'].map(driver_map).fillna(-1).astype(int)
-    
-    feature_cols.extend(['tire_compound_code', 'team_code', 'driver_code'])
+    categorical_cols = ['tire_compound_code', 'team_code', 'driver_code']
+    feature_cols.extend(categorical_cols)
     
     X = df[feature_cols]
     y_win = df['label_win']
@@ -72,7 +79,7 @@ def train_models():
         num_leaves=31, min_child_samples=20
     )
     win_model = CalibratedClassifierCV(base_win, method='isotonic', cv=3)
-    win_model.fit(X_train, y_win_train)
+    win_model.fit(X_train, y_win_train, categorical_feature=categorical_cols)
     
     win_pred = win_model.predict(X_test)
     win_proba = win_model.predict_proba(X_test)[:, 1]
@@ -89,7 +96,7 @@ def train_models():
         num_leaves=31, min_child_samples=20
     )
     podium_model = CalibratedClassifierCV(base_podium, method='isotonic', cv=3)
-    podium_model.fit(X_train, y_podium_train)
+    podium_model.fit(X_train, y_podium_train, categorical_feature=categorical_cols)
     
     podium_pred = podium_model.predict(X_test)
     podium_proba = podium_model.predict_proba(X_test)[:, 1]
@@ -102,6 +109,9 @@ def train_models():
     os.makedirs(MODEL_DIR, exist_ok=True)
     joblib.dump(win_model, os.path.join(MODEL_DIR, "win_model.joblib"))
     joblib.dump(podium_model, os.path.join(MODEL_DIR, "podium_model.joblib"))
+    save_encoders(os.path.join(MODEL_DIR, RACE_ENCODERS_FILE), encoders)
+    export_calibrated_folds(win_model, "win_model")
+    export_calibrated_folds(podium_model, "podium_model")
     
     # Feature importance from the base estimators inside the calibrated wrapper
     print("\nFeature Importance (Win Model - LightGBM base):")
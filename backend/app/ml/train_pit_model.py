@@ -5,6 +5,8 @@ import joblib
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
 
+from app.ml.encoders import PIT_TEAMS, TIRE_COMPOUNDS, PIT_ENCODERS_FILE, save_encoders
+
 DATA_PATH = "app/ml/data/pit_strategy_data.csv"
 MODEL_DIR = "app/ml/models"
 MODEL_PATH = os.path.join(MODEL_DIR, "pit_model.joblib")
@@ -17,9 +19,11 @@ def train_pit_model():
     print("Loading data...")
     df = pd.read_csv(DATA_PATH)
 
-    # Encode categorical features
-    df['tire_compound_code'] = df['tire_compound'].astype('category').cat.codes
-    df['team_code'] = df['team'].astype('category').cat.codes
+    # Encode categorical features against fixed vocabularies so codes don't
+    # depend on which labels happen to appear in the CSV (unknown -> -1)
+    encoders = {"tire": TIRE_COMPOUNDS, "team": PIT_TEAMS}
+    df['tire_compound_code'] = pd.Index(encoders["tire"]).get_indexer(df['tire_compound']).astype("int8")
+    df['team_code'] = pd.Index(encoders["team"]).get_indexer(df['team']).astype("int8")
 
     # Feature columns
     feature_cols = [
@@ -70,6 +74,7 @@ def train_pit_model():
     # Save model
     os.makedirs(MODEL_DIR, exist_ok=True)
     joblib.dump(model, MODEL_PATH)
+    save_encoders(os.path.join(MODEL_DIR, PIT_ENCODERS_FILE), encoders)
     print(f"\nModel saved to {MODEL_PATH}")
 
 if __name__ == "__main__":
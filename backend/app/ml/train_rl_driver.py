@@ -9,6 +9,7 @@ from stable_baselines3.common.evaluation import evaluate_policy
 from stable_baselines3.common.callbacks import EvalCallback
 
 from app.ml.env import F1RaceEnv
+from app.ml.rl_predictor import export_deterministic_actor, export_policy_weights
 
 MODEL_DIR = "app/ml/models"
 MODEL_PATH = os.path.join(MODEL_DIR, "ppo_f1_driver")
@@ -51,6 +52,10 @@ def train_rl_agent():
     os.makedirs(MODEL_DIR, exist_ok=True)
     model.save(MODEL_PATH)
     print(f"\nModel saved to {MODEL_PATH}.zip")
+    export_deterministic_actor(model, MODEL_PATH + ".pt")
+    print(f"TorchScript actor saved to {MODEL_PATH}.pt")
+    export_policy_weights(model, MODEL_PATH + ".policy.pth")
+    print(f"Policy weights saved to {MODEL_PATH}.policy.pth")
     
     print("\nEvaluating trained policy...")
     mean_reward, std_reward = evaluate_policy(model, env, n_eval_episodes=5)
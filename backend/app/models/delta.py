@@ -0,0 +1,153 @@
+"""
+Per-tick RaceState deltas for streaming consumers (WebSocket / Redis feed).
+
+The first encode() sends the full state; later calls send only the per-car
+columns that changed since the previous tick (compared on the CarArrays view,
+matched by driver so re-sorting the grid only sends the new order), new
+events and a race control change.
+"""
+
+from typing import Optional, TypedDict
+
+import numpy as np
+from pydantic_core import to_json
+
+from .race_state import CarArrays, Event, RaceState
+
+# CarArrays columns that can change tick to tick (identity columns never do)
+DELTA_FIELDS = (
+    "position", "lap", "sector", "lap_progress", "speed", "fuel",
+    "gap_to_leader", "interval", "tire_age", "tire_wear", "pit_stops",
+    "ers_battery", "drs_active", "in_pit_lane", "compound_code", "status_code",
+    "driver_skill", "momentum", "mode_code",
+)
+
+
+# Wire precision per float column when quantizing (UI shows 1-3 decimals)
+QUANTIZE_DECIMALS = {
+    "lap_progress": 4, "speed": 1, "fuel": 2, "tire_wear": 3,
+    "gap_to_leader": 3, "interval": 3, "ers_battery": 2,
+    "driver_skill": 3, "momentum": 2,
+}
+
+
+class RaceStateDelta(TypedDict):
+    tick: int
+    order: Optional[list[str]]  # drivers in the new grid order, set only when it changed
+    cars: list[tuple[int, dict]]  # (grid index after any reorder, {field: new value})
+    new_events: list[dict]
+    race_control: Optional[str]  # set only when it changed
+
+
+def _changed(prev: np.ndarray, curr: np.ndarray) -> np.ndarray:
+    """Element-wise change mask; NaN -> NaN (missing gap stays missing) is unchanged."""
+    diff = prev != curr
+    if curr.dtype.kind == "f":
+        diff &= ~(np.isnan(prev) & np.isnan(curr))
+    return diff
+
+
+def _event_key(event: Event) -> tuple:
+    """Value identity of an event: survives model_copy and JSON round trips, unlike `is`."""
+    return (event.tick, event.lap, event.event_type, event.driver, event.description)
+
+
+def _json_value(value):
+    # NaN marks a None gap in CarArrays
+    return None if isinstance(value, float) and value != value else value
+
+
+class RaceStateDeltaEncoder:
+    """
+    Stateful encoder for one race stream: full snapshot first, deltas after.
+    With quantize=True the float columns are rounded to QUANTIZE_DECIMALS before
+    diffing, so deltas carry short values and changes below display precision
+    are not sent at all.
+    """
+
+    def __init__(self, quantize: bool = False):
+        self._quantize = quantize
+        self._prev: Optional[dict[str, np.ndarray]] = None
+        self._drivers: Optional[list[str]] = None
+        self._driver_index: dict[str, int] = {}
+        self._race_control = None
+        self._last_event_key: Optional[tuple] = None
+
+    def reset(self):
+        """Force the next encode() to send a full snapshot (e.g. a client reconnect)."""
+        self._prev = None
+
+    def encode(self, state: RaceState) -> dict:
+        """Returns {"full": <state dump>} or {"delta": RaceStateDelta}."""
+        arrays = state.arrays
+        if self._needs_full(arrays):
+            self._remember(state, arrays)
+            return {"full": state.model_dump(mode="json")}
+        return {"delta": self._delta(state, arrays)}
+
+    def encode_json(self, state: RaceState) -> str:
+        """
+        encode() serialised to a JSON string for the wire, using pydantic-core's
+        serializer directly (no model_dump -> json.dumps double pass).
+        """
+        arrays = state.arrays
+        if self._needs_full(arrays):
+            self._remember(state, arrays)
+            return '{"full":%s}' % state.model_dump_json()
+        return to_json({"delta": self._delta(state, arrays)}).decode()
+
+    def _needs_full(self, arrays: CarArrays) -> bool:
+        # A reorder (cars re-sorted by position) is sent as a delta; only a
+        # different set of drivers needs a new snapshot
+        if self._prev is None or len(arrays.driver) != len(self._drivers):
+            return True
+        return not all(driver in self._driver_index for driver in arrays.driver)
+
+    def _delta(self, state: RaceState, arrays: CarArrays) -> RaceStateDelta:
+        prev, order = self._prev, None
+        if arrays.driver != self._drivers:
+            # Line the previous columns up with the new order, matched by driver
+            perm = np.fromiter((self._driver_index[d] for d in arrays.driver),
+                               dtype=np.intp, count=len(arrays.driver))
+            prev = {field: column[perm] for field, column in prev.items()}
+            order = list(arrays.driver)
+
+        changed_cars: dict[int, dict] = {}
+        for field in DELTA_FIELDS:
+            curr = self._column(arrays, field)
+            idx = np.flatnonzero(_changed(prev[field], curr))
+            for i, value in zip(idx.tolist(), curr[idx].tolist()):
+                changed_cars.setdefault(i, {})[field] = _json_value(value)
+
+        delta: RaceStateDelta = {
+            "tick": state.meta.tick,
+            "order": order,
+            "cars": sorted(changed_cars.items()),
+            "new_events": [e.model_dump(mode="json") for e in self._new_events(state.events)],
+            "race_control": state.race_control.value if state.race_control is not self._race_control else None,
+        }
+        self._remember(state, arrays)
+        return delta
+
+    def _column(self, arrays: CarArrays, field: str) -> np.ndarray:
+        column = getattr(arrays, field)
+        if self._quantize and field in QUANTIZE_DECIMALS:
+            return np.round(column, QUANTIZE_DECIMALS[field])
+        return column
+
+    def _new_events(self, events: list[Event]) -> list[Event]:
+        if self._last_event_key is None:
+            return list(events)
+        for i in range(len(events) - 1, -1, -1):
+            if _event_key(events[i]) == self._last_event_key:
+                return events[i + 1:]
+        # Last sent event was trimmed out of the window: everything retained is new
+        return list(events)
+
+    def _remember(self, state: RaceState, arrays: CarArrays):
+        # Copies: the caller may keep updating this CarArrays view in place
+        self._prev = {field: self._column(arrays, field).copy() for field in DELTA_FIELDS}
+        self._drivers = list(arrays.driver)
+        self._driver_index = {driver: i for i, driver in enumerate(self._drivers)}
+        self._race_control = state.race_control
+        self._last_event_key = _event_key(state.events[-1]) if state.events else None
@@ -0,0 +1,59 @@
+"""
+Race enums, kept free of pydantic so lightweight modules (scenario config
+types, ML encoders) can import them without building the RaceState models.
+Re-exported from app.models.race_state.
+"""
+
+from enum import Enum
+
+class TireCompound(str, Enum):
+    """Tire compounds available during a race."""
+    SOFT = "SOFT"
+    MEDIUM = "MEDIUM"
+    HARD = "HARD"
+    INTERMEDIATE = "INTERMEDIATE"
+    WET = "WET"
+
+class CarStatus(str, Enum):
+    """Car status during a race."""
+    RACING = "RACING"
+    PITTED = "PITTED"
+    DNF = "DNF"
+
+class SectorType(str, Enum):
+    """Track Sector classification"""
+    SLOW = "SLOW"
+    MEDIUM = "MEDIUM"
+    FAST = "FAST"
+
+class DrivingMode(str, Enum):
+    """Driver strategy mode"""
+    PUSH = "PUSH"         # High speed, high wear/fuel
+    BALANCED = "BALANCED" # Normal
+    CONSERVE = "CONSERVE" # Low speed, saves wear/fuel
+
+class EventType(str, Enum):
+    """Types of events that can occur during a race"""
+    SAFETY_CAR = "SAFETY_CAR"
+    VIRTUAL_SAFETY_CAR = "VIRTUAL_SAFETY_CAR"
+    RED_FLAG = "RED_FLAG"
+    YELLOW_FLAG = "YELLOW_FLAG"
+    GREEN_FLAG = "GREEN_FLAG"
+    PIT_STOP = "PIT_STOP"
+    PIT_OUT = "PIT_OUT"
+    PIT_IN = "PIT_IN"
+    OVERTAKE = "OVERTAKE"
+    DNF = "DNF"
+    FASTEST_LAP = "FASTEST_LAP"
+    MODE_CHANGE = "MODE_CHANGE"
+    WEATHER_CHANGE = "WEATHER_CHANGE"
+    RACE_FINISH = "RACE_FINISH"
+    LAP_COMPLETE = "LAP_COMPLETE"
+
+class RaceControl(str, Enum):
+    """Mutually exclusive race control states"""
+    GREEN = "GREEN"
+    YELLOW = "YELLOW"
+    VSC = "VSC"
+    SAFETY_CAR = "SAFETY_CAR"
+    RED_FLAG = "RED_FLAG"
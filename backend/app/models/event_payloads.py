@@ -0,0 +1,119 @@
+"""
+Typed payload schemas for race Events.
+
+Event.payload stays a plain dict on the wire; these models give producers and
+consumers a checked shape per EventType (see typed_payload / EVENT_PAYLOAD_MODELS).
+Event types without a schema (flags, lap complete, ...) keep a free-form dict.
+validate_event() checks a raw event dict (replay logs, ingestion) in one pass
+by dispatching on its event_type to a prebuilt per-type adapter.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+from .race_state import DrivingMode, Event, EventType, TireCompound
+
+
+class EventPayload(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+
+class PitStopPayload(EventPayload):
+    compound: TireCompound = Field(description="Compound fitted at the stop")
+    pit_lane_time: Optional[float] = Field(default=None, ge=0.0, description="Seconds spent in the pit lane")
+
+
+class OvertakePayload(EventPayload):
+    overtaken: str = Field(min_length=3, max_length=3, description="Driver who lost the place")
+    position: int = Field(ge=1, le=22, description="Position gained")
+
+
+class DNFPayload(EventPayload):
+    reason: str = Field(default="", description="Retirement cause")
+
+
+class FastestLapPayload(EventPayload):
+    lap_time: float = Field(gt=0.0, description="Lap time in seconds")
+
+
+class ModeChangePayload(EventPayload):
+    mode: DrivingMode
+
+
+class WeatherChangePayload(EventPayload):
+    rain_probability: float = Field(ge=0.0, le=1.0)
+    temperature: Optional[float] = Field(default=None, description="Celsius")
+
+
+EVENT_PAYLOAD_MODELS: dict[EventType, type[EventPayload]] = {
+    EventType.PIT_STOP: PitStopPayload,
+    EventType.PIT_OUT: PitStopPayload,
+    EventType.OVERTAKE: OvertakePayload,
+    EventType.DNF: DNFPayload,
+    EventType.FASTEST_LAP: FastestLapPayload,
+    EventType.MODE_CHANGE: ModeChangePayload,
+    EventType.WEATHER_CHANGE: WeatherChangePayload,
+}
+
+
+def typed_payload(event: Event) -> EventPayload | dict:
+    """Validate an event's payload against its type's schema (dict if it has none)."""
+    model = EVENT_PAYLOAD_MODELS.get(event.event_type)
+    if model is None:
+        return event.payload
+    return model.model_validate(event.payload)
+
+
+# Event variants with the payload schema inlined, so a raw dict validates in one call
+class PitStopEvent(Event):
+    payload: PitStopPayload
+
+
+class OvertakeEvent(Event):
+    payload: OvertakePayload
+
+
+class DNFEvent(Event):
+    payload: DNFPayload = Field(default_factory=DNFPayload)
+
+
+class FastestLapEvent(Event):
+    payload: FastestLapPayload
+
+
+class ModeChangeEvent(Event):
+    payload: ModeChangePayload
+
+
+class WeatherChangeEvent(Event):
+    payload: WeatherChangePayload
+
+
+_TYPED_EVENTS: dict[type[EventPayload], type[Event]] = {
+    PitStopPayload: PitStopEvent,
+    OvertakePayload: OvertakeEvent,
+    DNFPayload: DNFEvent,
+    FastestLapPayload: FastestLapEvent,
+    ModeChangePayload: ModeChangeEvent,
+    WeatherChangePayload: WeatherChangeEvent,
+}
+
+_EVENT_ADAPTERS: dict[EventType, TypeAdapter] = {
+    event_type: TypeAdapter(_TYPED_EVENTS[model]) for event_type, model in EVENT_PAYLOAD_MODELS.items()
+}
+
+
+def validate_event(raw: dict) -> Event:
+    """
+    Validate a raw event dict, including its payload schema when the type has one.
+    Returns a plain Event (payload kept as the given dict, as on the wire).
+    """
+    adapter = _EVENT_ADAPTERS.get(raw.get("event_type"))
+    if adapter is None:
+        return Event.model_validate(raw)
+    event = adapter.validate_python(raw)
+    return Event.safe_new(
+        event.tick, event.lap, event.event_type, event.driver,
+        payload=dict(raw.get("payload") or {}), description=event.description,
+    )
@@ -2,82 +2,64 @@
 RaceState: Single source of truth for the entire race.
 """
 
-from pydantic import BaseModel, Field
+import math
+import threading
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import List
-from enum import Enum
-
-class TireCompound(str, Enum):
-    """Tire compounds available during a race."""
-    SOFT = "SOFT"
-    MEDIUM = "MEDIUM"
-    HARD = "HARD"
-    INTERMEDIATE = "INTERMEDIATE"
-    WET = "WET"
-
-class CarStatus(str, Enum):
-    """Car status during a race."""
-    RACING = "RACING"
-    PITTED = "PITTED"
-    DNF = "DNF"
-
-class SectorType(str, Enum):
-    """Track Sector classification"""
-    SLOW = "SLOW"
-    MEDIUM = "MEDIUM"
-    FAST = "FAST"
-
-class DrivingMode(str, Enum):
-    """Driver strategy mode"""
-    PUSH = "PUSH"         # High speed, high wear/fuel
-    BALANCED = "BALANCED" # Normal
-    CONSERVE = "CONSERVE" # Low speed, saves wear/fuel
+
+from .enums import CarStatus, DrivingMode, EventType, RaceControl, SectorType, TireCompound
 
 class TireState(BaseModel):
-    """Tire state during a race"""
+    """Tire state during a race (immutable: fit a new set via model_copy/constructor)"""
+    model_config = ConfigDict(frozen=True)
+
     compound: TireCompound
     age: int = Field(ge=0, description="Laps on this set")
     wear: float = Field(ge=0.0, le=1.0, description="0.0 = new, 1.0 = worn out")
 
 class Weather(BaseModel):
-    """Track weather conditions"""        
+    """Track weather conditions"""
+    model_config = ConfigDict(frozen=True)
+
     rain_probability: float = Field(ge=0.0, le=1.0)
     temperature: float = Field(description="Celsius")
     wind_speed: float = Field(ge=0.0, description="km/h")
 
 class DRSZone(BaseModel):
     """DRS activation zone on the track"""
+    model_config = ConfigDict(frozen=True)
+
     start: float = Field(ge=0.0, le=1.0, description="lap_progress where DRS can be activated")
     end: float = Field(ge=0.0, le=1.0, description="lap_progress where DRS ends")
 
 class Sector(BaseModel):
     """A section of the Track"""
+    model_config = ConfigDict(frozen=True)
+
     sector_type: SectorType
     length: int = Field(gt=0, description="length in meters")    
 
+    @classmethod
+    def get(cls, sector_type: SectorType, length: int) -> "Sector":
+        """Shared instance per (sector_type, length); tracks reuse identical sectors."""
+        key = (SectorType(sector_type), length)
+        sector = _SECTORS.get(key)
+        if sector is None:
+            sector = _SECTORS[key] = cls(sector_type=sector_type, length=length)
+        return sector
+
+_SECTORS: dict[tuple, Sector] = {}
+
 class TrackBoundary(BaseModel):
-    """2D spatial limits of the track"""
-    inner_x: list[float] = Field(default_factory=list)
-    inner_y: list[float] = Field(default_factory=list)
-    outer_x: list[float] = Field(default_factory=list)
-    outer_y: list[float] = Field(default_factory=list)
-
-class EventType(str, Enum):
-    """Types of events that can occur during a race"""
-    SAFETY_CAR = "SAFETY_CAR"
-    VIRTUAL_SAFETY_CAR = "VIRTUAL_SAFETY_CAR"
-    RED_FLAG = "RED_FLAG"
-    YELLOW_FLAG = "YELLOW_FLAG"
-    GREEN_FLAG = "GREEN_FLAG"
-    PIT_STOP = "PIT_STOP"
-    PIT_OUT = "PIT_OUT"
-    PIT_IN = "PIT_IN"
-    OVERTAKE = "OVERTAKE"
-    DNF = "DNF"
-    FASTEST_LAP = "FASTEST_LAP"
-    MODE_CHANGE = "MODE_CHANGE"
-    WEATHER_CHANGE = "WEATHER_CHANGE"
-    RACE_FINISH = "RACE_FINISH"
-    LAP_COMPLETE = "LAP_COMPLETE"
+    """2D spatial limits of the track (immutable, shared with the frozen Track)"""
+    model_config = ConfigDict(frozen=True)
+
+    inner_x: tuple[float, ...] = ()
+    inner_y: tuple[float, ...] = ()
+    outer_x: tuple[float, ...] = ()
+    outer_y: tuple[float, ...] = ()
 
 class Meta(BaseModel):
     """Simulation metadata for replay and determinism"""
@@ -87,6 +69,8 @@ class Meta(BaseModel):
     laps_total: int = Field(gt=0, description="Total laps in the race")
 
 class CarIdentity(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     driver: str = Field(min_length=3, max_length=3)
     team: str
 
@@ -141,6 +125,59 @@ class Car(BaseModel):
     in_pit_lane: bool = Field(default=False)
     pit_lane_progress: float = Field(ge=0.0, le=1.0, default=0.0)
     momentum: float = Field(default=0.0, ge=-1.0, le=1.0, description="Driver momentum: -1=tilting, +1=on fire")
+
+    @classmethod
+    def from_flat(
+        cls,
+        *,
+        driver: str,
+        team: str,
+        speed: float,
+        fuel: float,
+        lap_progress: float,
+        compound: "TireCompound | str",
+        tire_age: int,
+        tire_wear: float,
+        position: int,
+        lap: int,
+        sector: int = 0,
+        gap_to_leader: float | None = None,
+        interval: float | None = None,
+        last_lap_time: float | None = None,
+        best_lap_time: float | None = None,
+        dirty_air_effect: float = 0.0,
+        drs_active: bool = False,
+        ers_battery: float = 4.0,
+        driving_mode: DrivingMode = DrivingMode.BALANCED,
+        **car_fields,
+    ) -> "Car":
+        """
+        Build a Car from flat per-car fields in a single validation pass
+        (pydantic-core validates the nested dicts instead of one __init__ per sub-model).
+        Remaining Car-level fields (pit_stops, status, driver_skill, ...) go in car_fields.
+        """
+        return cls.model_validate({
+            "identity": {"driver": driver, "team": team},
+            "telemetry": {
+                "speed": speed,
+                "fuel": fuel,
+                "lap_progress": lap_progress,
+                "tire_state": {"compound": compound, "age": tire_age, "wear": tire_wear},
+                "dirty_air_effect": dirty_air_effect,
+            },
+            "systems": {"drs_active": drs_active, "ers_battery": ers_battery},
+            "strategy": {"driving_mode": driving_mode},
+            "timing": {
+                "position": position,
+                "lap": lap,
+                "sector": sector,
+                "gap_to_leader": gap_to_leader,
+                "interval": interval,
+                "last_lap_time": last_lap_time,
+                "best_lap_time": best_lap_time,
+            },
+            **car_fields,
+        })
     
 class TrackEvolution(BaseModel):
     """Track surface evolution state — rubber buildup and grip changes"""
@@ -150,6 +187,9 @@ class TrackEvolution(BaseModel):
 
 class Track(BaseModel):
     """describes the Circuit where the race is happening"""
+    # Shared between races/scenarios; derive per-race variants with model_copy(update=...)
+    model_config = ConfigDict(frozen=True)
+
     id: str = Field(description="Unique identifier for the track")
     name: str = Field(description="Name of the track")
     length: int= Field(gt=0, description="Length of track in meters")
@@ -178,16 +218,74 @@ class Track(BaseModel):
     # Track evolution state
     track_evolution: TrackEvolution = Field(default_factory=TrackEvolution, description="Surface grip evolution")
 
-class RaceControl(str, Enum):
-    """Mutually exclusive race control states"""
-    GREEN = "GREEN"
-    YELLOW = "YELLOW"
-    VSC = "VSC"
-    SAFETY_CAR = "SAFETY_CAR"
-    RED_FLAG = "RED_FLAG"
+    @property
+    def short_key(self) -> str:
+        """Base track id used by per-track tables such as TRACK_AFFINITY ("monza_2024" -> "monza")."""
+        return self.id.split("_", 1)[0]
+
+
+def enum_codes(enum_cls) -> dict:
+    """Small-int code per enum member (definition order), for array / hot-loop use."""
+    return {member: code for code, member in enumerate(enum_cls)}
+
+# Enum <-> uint8 lookup tables. The str enums stay the API/persistence format;
+# array code uses the codes (e.g. CarArrays.compound_code) and maps back by index.
+TIRE_COMPOUND_CODES = enum_codes(TireCompound)
+CAR_STATUS_CODES = enum_codes(CarStatus)
+SECTOR_TYPE_CODES = enum_codes(SectorType)
+DRIVING_MODE_CODES = enum_codes(DrivingMode)
+EVENT_TYPE_CODES = enum_codes(EventType)
+RACE_CONTROL_CODES = enum_codes(RaceControl)
+
+# Interned driver / team name codes (CarArrays.driver_code / team_code), so array
+# code compares small ints instead of strings. A code is assigned the first time
+# a name is seen and stays fixed for the process; use ml.encoders for model input.
+DRIVER_CODES: dict[str, int] = {}
+TEAM_CODES: dict[str, int] = {}
+# Guards the miss path: from_cars runs on FastAPI's threadpool, and two threads
+# interning different new names must not both read the same len(table)
+_INTERN_LOCK = threading.Lock()
+
+def intern_code(table: dict, name: str) -> int:
+    code = table.get(name)
+    if code is None:
+        with _INTERN_LOCK:
+            code = table.get(name)
+            if code is None:
+                code = table[name] = len(table)
+    return code
+
+# Packed tire word: compound code << 24 | age (laps, saturates at 255) << 16 | wear as u16 fixed point
+TIRE_WEAR_SCALE = 65535
+
+def pack_tires(compound_code, age, wear):
+    """Pack tire columns (scalars or arrays) into uint32 words; wear is quantised to 1/65535."""
+    compound_code = np.asarray(compound_code, dtype=np.uint32)
+    age = np.minimum(np.asarray(age), 255).astype(np.uint32)
+    wear = np.rint(np.clip(wear, 0.0, 1.0) * TIRE_WEAR_SCALE).astype(np.uint32)
+    return (compound_code << 24) | (age << 16) | wear
+
+def unpack_tires(packed):
+    """Inverse of pack_tires -> (compound_code uint8, age int32, wear float64)."""
+    packed = np.asarray(packed, dtype=np.uint32)
+    return (
+        (packed >> 24).astype(np.uint8),
+        ((packed >> 16) & 0xFF).astype(np.int32),
+        (packed & 0xFFFF) / TIRE_WEAR_SCALE,
+    )
+
+def pack_tire(tire: TireState) -> int:
+    return int(pack_tires(TIRE_COMPOUND_CODES[tire.compound], tire.age, tire.wear))
+
+def unpack_tire(packed: int) -> TireState:
+    """Rebuild a TireState from a packed word (fields come from pack_tires, so no re-validation)."""
+    code, age, wear = unpack_tires(packed)
+    return TireState.model_construct(compound=list(TireCompound)[code], age=int(age), wear=float(wear))
 
 class Event(BaseModel):
     """Event that occurred during the race"""
+    model_config = ConfigDict(frozen=True)
+
     tick: int = Field(ge=0, description="Tick at which the event occurred")
     lap: int = Field(ge=0, description="Lap at which the event occurred")
     event_type: EventType
@@ -195,6 +293,174 @@ class Event(BaseModel):
     payload: dict = Field(default_factory=dict, description="Structured event data")
     description: str = Field(default="", description="Human-readable description (built from payload)")
 
+    @classmethod
+    def safe_new(
+        cls,
+        tick: int,
+        lap: int,
+        event_type: EventType,
+        driver: str | None = None,
+        payload: dict | None = None,
+        description: str = "",
+    ) -> "Event":
+        """
+        Build an Event without validation, for values the simulator itself produced.
+        Anything coming from API / ingestion input must go through Event(...).
+        """
+        return cls.model_construct(
+            tick=tick, lap=lap, event_type=event_type, driver=driver,
+            payload={} if payload is None else payload, description=description,
+        )
+
+class CarArrays(BaseModel):
+    """
+    Structure-of-arrays projection of RaceState.cars (one entry per car, grid order).
+    Optional timing gaps are NaN where the Car field is None.
+
+    Vectorized code reads/updates these columns; to_cars() writes them back onto
+    the Car models at API / serialization boundaries.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    driver: list[str]
+    team: list[str]
+    driver_code: np.ndarray  # int16, DRIVER_CODES
+    team_code: np.ndarray  # int16, TEAM_CODES
+    tire_compound: list[str]
+    compound_code: np.ndarray  # uint8, TIRE_COMPOUND_CODES
+    status_code: np.ndarray  # uint8, CAR_STATUS_CODES
+    mode_code: np.ndarray  # uint8, DRIVING_MODE_CODES
+    position: np.ndarray
+    lap: np.ndarray
+    sector: np.ndarray
+    lap_progress: np.ndarray
+    speed: np.ndarray
+    fuel: np.ndarray
+    gap_to_leader: np.ndarray
+    interval: np.ndarray
+    tire_age: np.ndarray
+    tire_wear: np.ndarray
+    pit_stops: np.ndarray
+    driver_skill: np.ndarray
+    momentum: np.ndarray
+    ers_battery: np.ndarray
+    drs_active: np.ndarray
+    in_pit_lane: np.ndarray
+
+    @classmethod
+    def from_cars(cls, cars: list["Car"]) -> "CarArrays":
+        n = len(cars)
+        timings = [car.timing for car in cars]
+        telemetries = [car.telemetry for car in cars]
+        tires = [t.tire_state for t in telemetries]
+        nan = float("nan")
+
+        def floats(values):
+            return np.fromiter(values, dtype=np.float64, count=n)
+
+        def ints(values):
+            return np.fromiter(values, dtype=np.int32, count=n)
+
+        def bools(values):
+            return np.fromiter(values, dtype=np.bool_, count=n)
+
+        def codes(values, table):
+            return np.fromiter((table[v] for v in values), dtype=np.uint8, count=n)
+
+        return cls(
+            driver=[car.identity.driver for car in cars],
+            team=[car.identity.team for car in cars],
+            driver_code=np.fromiter(
+                (intern_code(DRIVER_CODES, car.identity.driver) for car in cars), dtype=np.int16, count=n),
+            team_code=np.fromiter(
+                (intern_code(TEAM_CODES, car.identity.team) for car in cars), dtype=np.int16, count=n),
+            tire_compound=[tire.compound.value for tire in tires],
+            compound_code=codes((tire.compound for tire in tires), TIRE_COMPOUND_CODES),
+            status_code=codes((car.status for car in cars), CAR_STATUS_CODES),
+            mode_code=codes((car.strategy.driving_mode for car in cars), DRIVING_MODE_CODES),
+            position=ints(t.position for t in timings),
+            lap=ints(t.lap for t in timings),
+            sector=ints(t.sector for t in timings),
+            lap_progress=floats(t.lap_progress for t in telemetries),
+            speed=floats(t.speed for t in telemetries),
+            fuel=floats(t.fuel for t in telemetries),
+            gap_to_leader=floats(nan if t.gap_to_leader is None else t.gap_to_leader for t in timings),
+            interval=floats(nan if t.interval is None else t.interval for t in timings),
+            tire_age=ints(tire.age for tire in tires),
+            tire_wear=floats(tire.wear for tire in tires),
+            pit_stops=ints(car.pit_stops for car in cars),
+            driver_skill=floats(car.driver_skill for car in cars),
+            momentum=floats(car.momentum for car in cars),
+            ers_battery=floats(car.systems.ers_battery for car in cars),
+            drs_active=bools(car.systems.drs_active for car in cars),
+            in_pit_lane=bools(car.in_pit_lane for car in cars),
+        )
+
+    def running_order(self) -> np.ndarray:
+        """
+        Grid indices sorted leader first by race distance (lap + lap_progress),
+        retired cars last. Cars keep their grid order; only this permutation moves.
+        """
+        distance = self.lap + self.lap_progress
+        distance = np.where(self.status_code == CAR_STATUS_CODES[CarStatus.DNF], -np.inf, distance)
+        return np.argsort(-distance, kind="stable").astype(np.int8)
+
+    def assign_positions(self) -> np.ndarray:
+        """Recompute the position column from running_order(); returns the order."""
+        order = self.running_order()
+        self.position[order] = np.arange(1, len(order) + 1, dtype=self.position.dtype)
+        return order
+
+    def packed_tires(self) -> np.ndarray:
+        """Tire state of every car as one uint32 word each (see pack_tires)."""
+        return pack_tires(self.compound_code, self.tire_age, self.tire_wear)
+
+    def to_cars(self, cars: list["Car"]) -> list["Car"]:
+        """
+        Write the per-car columns back onto `cars` (same grid order) and return them.
+        Compound, status and driving mode come from the code columns (tire_compound
+        is read-only). Identity and non-projected fields (personality, ...) are untouched.
+        """
+        if len(cars) != len(self.driver):
+            raise ValueError(f"CarArrays has {len(self.driver)} cars, got {len(cars)}")
+
+        compounds = list(TireCompound)
+        statuses = list(CarStatus)
+        modes = list(DrivingMode)
+        gaps = self.gap_to_leader.tolist()
+        intervals = self.interval.tolist()
+        for i, car in enumerate(cars):
+            timing = car.timing
+            telemetry = car.telemetry
+            timing.position = int(self.position[i])
+            timing.lap = int(self.lap[i])
+            timing.sector = int(self.sector[i])
+            timing.gap_to_leader = None if math.isnan(gaps[i]) else gaps[i]
+            timing.interval = None if math.isnan(intervals[i]) else intervals[i]
+
+            telemetry.lap_progress = float(self.lap_progress[i])
+            telemetry.speed = float(self.speed[i])
+            telemetry.fuel = float(self.fuel[i])
+
+            tire = telemetry.tire_state
+            compound = compounds[self.compound_code[i]]
+            age, wear = int(self.tire_age[i]), float(self.tire_wear[i])
+            if (tire.compound, tire.age, tire.wear) != (compound, age, wear):
+                telemetry.tire_state = TireState(compound=compound, age=age, wear=wear)
+
+            car.systems.ers_battery = float(self.ers_battery[i])
+            car.systems.drs_active = bool(self.drs_active[i])
+            car.pit_stops = int(self.pit_stops[i])
+            car.driver_skill = float(self.driver_skill[i])
+            car.momentum = float(self.momentum[i])
+            car.in_pit_lane = bool(self.in_pit_lane[i])
+            car.status = statuses[self.status_code[i]]
+            car.strategy.driving_mode = modes[self.mode_code[i]]
+        return cars
+
+# Events retained on a RaceState via add_event (older ones are dropped)
+MAX_EVENTS = 256
+
 class RaceState(BaseModel):
     """
     Single source of truth for the entire race.
@@ -215,5 +481,76 @@ class RaceState(BaseModel):
     drs_enabled: bool = Field(default=False)
     sc_deploy_lap: int | None = Field(default=None, description="Lap when SC was deployed (None = no active SC)")
 
+    def add_event(self, event: Event) -> None:
+        """Append an event, keeping only the most recent MAX_EVENTS (the UI window)."""
+        events = self.events
+        events.append(event)
+        if len(events) > MAX_EVENTS:
+            del events[:len(events) - MAX_EVENTS]
+
+    @property
+    def arrays(self) -> CarArrays:
+        """
+        Per-car columns for vectorized consumers (ML, Monte Carlo, strategy).
+        Built fresh on each access: cars are mutated in place within a tick, so
+        a cached view can go stale. Bind it once per pass (arrays = state.arrays).
+        """
+        return CarArrays.from_cars(self.cars)
+
+    def cold_dump(self) -> dict:
+        """Race-constant part of the state (track, seed, laps, car identities): send once."""
+        return self.model_dump(mode="json", include=_COLD_FIELDS)
+
+    def hot_dump(self) -> dict:
+        """Tick-mutable part of the state: everything cold_dump() leaves out."""
+        return self.model_dump(mode="json", exclude=_COLD_FIELDS)
+
+    @classmethod
+    def from_dumps(cls, cold: dict, hot: dict) -> "RaceState":
+        """Rebuild a full state from a cold_dump() and a hot_dump() of the same race."""
+        data = {**cold, **hot, "meta": {**cold["meta"], **hot["meta"]}}
+        data["cars"] = [
+            {**car, "identity": ident["identity"]} for ident, car in zip(cold["cars"], hot["cars"])
+        ]
+        return cls.model_validate(data)
+
+
+def assert_invariants(state: RaceState) -> None:
+    """
+    Debug check of the Field bounds that in-place mutation skips: models are only
+    validated on construction (no validate_assignment), so simulator and
+    CarArrays.to_cars writes are trusted. Run it in tests, not per tick.
+    """
+    arrays = CarArrays.from_cars(state.cars)
+    n = len(state.cars)
+    bounded = {
+        "lap_progress": (0.0, 1.0),
+        "tire_wear": (0.0, 1.0),
+        "ers_battery": (0.0, 4.0),
+        "driver_skill": (0.0, 1.0),
+        "momentum": (-1.0, 1.0),
+        "speed": (0.0, np.inf),
+        "fuel": (0.0, np.inf),
+        "position": (1, 22),
+    }
+    for name, (low, high) in bounded.items():
+        column = getattr(arrays, name)
+        bad = np.flatnonzero((column < low) | (column > high))
+        assert not bad.size, f"{name} out of [{low}, {high}] for {[arrays.driver[i] for i in bad]}"
+    assert sorted(arrays.position.tolist()) == list(range(1, n + 1)), f"positions not 1..{n}: {arrays.position.tolist()}"
+    assert (arrays.tire_age >= 0).all() and (arrays.pit_stops >= 0).all(), "negative tire age / pit stops"
+    assert all(0.0 <= car.pit_lane_progress <= 1.0 for car in state.cars), "pit_lane_progress out of [0, 1]"
+    assert len(state.events) <= MAX_EVENTS, f"{len(state.events)} events retained (max {MAX_EVENTS})"
 
+# Fields that never change after the race starts (see RaceState.cold_dump / hot_dump)
+_COLD_FIELDS = {
+    "schema_version": True,
+    "track": True,
+    "meta": {"seed", "laps_total"},
+    "cars": {"__all__": {"identity"}},
+}
 
+# Prebuilt list serializers: one pydantic-core call for a whole list instead of
+# a model_dump() per element (e.g. CARS_ADAPTER.dump_json(state.cars)).
+CARS_ADAPTER = TypeAdapter(list[Car])
+DRS_ZONES_ADAPTER = TypeAdapter(list[DRSZone])
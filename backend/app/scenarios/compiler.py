@@ -3,6 +3,8 @@ Scenario Compiler system that takes a parameter-driven ScenarioConfig
 and sets up the RaceState.
 """
 
+from functools import lru_cache
+
 from ..models.race_state import (
     RaceState, Car, Meta, RaceControl,
     CarIdentity, CarTelemetry, CarSystems, CarStrategy, CarTiming,
@@ -11,6 +13,22 @@ from ..models.race_state import (
 from ..data.tracks import TRACKS, TRACK_MONACO, DRIVERS, TRACK_AFFINITY
 from .types import ScenarioConfig, GridCarConfig
 
+# O(1) driver lookup (DRIVERS is a list of dicts)
+_DRIVERS_BY_CODE = {d["driver"]: d for d in DRIVERS}
+# TRACK_AFFINITY flattened to (driver, track_key) -> multiplier: one lookup per car
+_AFFINITY = {
+    (driver, track_key): value
+    for driver, by_track in TRACK_AFFINITY.items()
+    for track_key, value in by_track.items()
+}
+
+@lru_cache(maxsize=None)
+def _track_skill(driver: str, track_key: str) -> float:
+    """Base skill scaled by track affinity; depends only on (driver, track), so memoized."""
+    driver_data = _DRIVERS_BY_CODE.get(driver)
+    base_skill = driver_data["skill"] if driver_data else 0.90
+    return min(0.999, base_skill * _AFFINITY.get((driver, track_key), 1.0))
+
 def compile_scenario(config: ScenarioConfig) -> RaceState:
     """
     Compiles a modular ScenarioConfig into a fully initialized RaceState.
@@ -42,14 +60,13 @@ def compile_scenario(config: ScenarioConfig) -> RaceState:
         )
     })
 
+    # Affinity tables are keyed by the base track id ("monza_2024" -> "monza").
+    # Unknown ids race on the Monaco fallback above but keep neutral affinity.
+    track_key = track.short_key if config.race_structure.track_id in TRACKS else ""
+
     cars = []
     for sc in config.race_structure.grid:
-        driver_data = next((d for d in DRIVERS if d["driver"] == sc.driver), None)
-        base_skill = driver_data["skill"] if driver_data else 0.90
-
-        track_key = config.race_structure.track_id.split("_")[0] if "_" in config.race_structure.track_id else config.race_structure.track_id
-        affinity = TRACK_AFFINITY.get(sc.driver, {}).get(track_key, 1.0)
-        skill = min(0.999, base_skill * affinity)
+        skill = _track_skill(sc.driver, track_key)
 
         # Apply DriverPersonality config overrides
         driver_cfg = config.drivers.get(sc.driver)
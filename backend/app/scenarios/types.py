@@ -1,12 +1,16 @@
 """
 Scenario configuration type definitions.
 Replaces the old prebuilt scenario types with a fully parameter-driven structure.
+Configs are immutable once validated, so one instance can be shared across
+requests/threads without defensive copies.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, List
-from ..models.race_state import TireCompound
+from ..models.enums import TireCompound
 
 class TeamConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str = ""
     engine_power: float = Field(ge=0.0, le=2.0, default=1.0)
     aero_efficiency: float = Field(ge=0.0, le=2.0, default=1.0)
@@ -16,6 +20,8 @@ class TeamConfig(BaseModel):
     strategy_bias: float = Field(ge=0.0, le=2.0, default=1.0)
 
 class CarEngineeringConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     downforce_level: float = Field(ge=0.0, le=2.0, default=1.0)
     drag_coefficient: float = Field(ge=0.0, le=2.0, default=1.0)
     ers_capacity: float = Field(ge=0.0, le=2.0, default=1.0)
@@ -26,6 +32,8 @@ class CarEngineeringConfig(BaseModel):
     tire_deg_multiplier: float = Field(ge=0.0, le=3.0, default=1.0)
 
 class DriverPersonalityConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     driver_id: str = ""
     aggression: float = Field(ge=0.0, le=2.0, default=1.0)
     risk_tolerance: float = Field(ge=0.0, le=2.0, default=1.0)
@@ -39,6 +47,8 @@ class DriverPersonalityConfig(BaseModel):
     championship_points: int = Field(ge=0, default=0, description="Current championship points")
 
 class GridCarConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     driver: str
     team: str
     position: int
@@ -49,6 +59,8 @@ class GridCarConfig(BaseModel):
     pit_stops: int = 0
 
 class RaceStructureConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     track_id: str = "monaco"
     total_laps: int = Field(ge=1, le=100, default=50)
     starting_lap: int = Field(ge=0, le=99, default=0)
@@ -62,16 +74,22 @@ class RaceStructureConfig(BaseModel):
     rubber_buildup_rate: float = Field(ge=0.0, default=0.002, description="Rubber buildup per lap")
 
 class WeatherTimelineEvent(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     start_lap: int
     rain_probability: float
     temperature: float
 
 class WeatherConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     timeline: List[WeatherTimelineEvent] = Field(default_factory=list)
     drying_rate: float = Field(ge=0.0, le=2.0, default=1.0)
     forecast_accuracy: float = Field(ge=0.0, le=1.0, default=0.8)
 
 class ChampionshipConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     championship_points_gap: int = 0
     must_finish: bool = False
     team_orders_priority: float = 0.5
@@ -79,6 +97,8 @@ class ChampionshipConfig(BaseModel):
     contract_pressure: float = 0.5
 
 class ChaosConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     mechanical_randomness: float = Field(ge=0.0, le=3.0, default=1.0)
     incident_frequency: float = Field(ge=0.0, le=3.0, default=1.0)
     safety_car_probability: float = Field(ge=0.0, le=3.0, default=1.0)
@@ -91,6 +111,8 @@ class ChaosConfig(BaseModel):
     chaos_scaling: str = Field(default="linear")  # linear, exponential, clustered
 
 class ScenarioConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     race_structure: RaceStructureConfig = Field(default_factory=RaceStructureConfig)
     weather: WeatherConfig = Field(default_factory=WeatherConfig)
     teams: Dict[str, TeamConfig] = Field(default_factory=dict)
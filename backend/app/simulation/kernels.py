@@ -0,0 +1,109 @@
+"""
+Vectorised physics kernels over CarArrays columns.
+
+Array counterparts of the per-car helpers in physics.py: same formulas, one
+call for the whole grid instead of one Python call per car. Compound and
+driving mode are passed as the uint8 code columns (CarArrays.compound_code /
+CarArrays.mode_code); random variance is passed in as pre-drawn gaussian
+noise so the caller owns the RNG stream (see gauss_noise).
+"""
+
+import numpy as np
+
+from app.models.race_state import DrivingMode, TireCompound
+from .physics import (
+    DIRTY_AIR_CORNER_PENALTY, DIRTY_AIR_DECAY_CONSTANT, DIRTY_AIR_RANGE,
+    DIRTY_AIR_TIRE_COEFF, _MODE_FUEL, _MODE_SPEED, _MODE_WEAR, _TIRE_WEAR_RATES,
+)
+from .rng import SeededRNG
+
+# Lookup tables indexed by TIRE_COMPOUND_CODES / DRIVING_MODE_CODES
+WEAR_RATE_BY_COMPOUND = np.array([_TIRE_WEAR_RATES[c.value] for c in TireCompound])
+SPEED_MULT_BY_MODE = np.array([_MODE_SPEED[m.value] for m in DrivingMode])
+WEAR_MULT_BY_MODE = np.array([_MODE_WEAR[m.value] for m in DrivingMode])
+FUEL_MULT_BY_MODE = np.array([_MODE_FUEL[m.value] for m in DrivingMode])
+
+# Sector-type penalty scale (matches calculate_dirty_air_penalty)
+_SECTOR_PENALTY_SCALE = {"SLOW": 1.0, "MEDIUM": 0.8, "FAST": 0.0}
+
+
+def gauss_noise(rng: SeededRNG, n: int, sigma: float) -> np.ndarray:
+    """Draw n gaussian samples from the race RNG (keeps runs reproducible per seed)."""
+    return np.fromiter((rng.gauss(0, sigma) for _ in range(n)), dtype=np.float64, count=n)
+
+
+def dirty_air_factor(gap_to_car_ahead: np.ndarray) -> np.ndarray:
+    """
+    Array version of calculate_dirty_air_factor.
+    NaN gaps (no car ahead, e.g. CarArrays.interval for the leader) are clean air.
+    """
+    gaps = np.nan_to_num(gap_to_car_ahead, nan=DIRTY_AIR_RANGE)
+    factor = np.exp(-np.maximum(gaps, 0.0) / DIRTY_AIR_DECAY_CONSTANT)
+    return np.where(gaps >= DIRTY_AIR_RANGE, 0.0, factor)
+
+
+def dirty_air_penalty(gap_to_car_ahead: np.ndarray, sector_type: str = "SLOW") -> np.ndarray:
+    """Array version of calculate_dirty_air_penalty (one sector type for the whole grid)."""
+    scale = _SECTOR_PENALTY_SCALE.get(sector_type, 1.0)
+    return DIRTY_AIR_CORNER_PENALTY * scale * dirty_air_factor(gap_to_car_ahead)
+
+
+def speed(
+    base_speed: float,
+    tire_wear: np.ndarray,
+    fuel_kg: np.ndarray,
+    driver_skill: np.ndarray,
+    mode_code: np.ndarray,
+    noise: np.ndarray,
+    rain_probability: float = 0.0,
+    dirty_air_penalty: np.ndarray | float = 0.0,
+    track_grip: float = 1.0,
+) -> np.ndarray:
+    """
+    Array version of calculate_speed. `noise` is the gaussian draw
+    (sigma 0.005) per car, i.e. gauss_noise(rng, n, 0.005).
+    """
+    result = (
+        base_speed
+        * SPEED_MULT_BY_MODE[mode_code]
+        * (1.0 - tire_wear * 0.15)
+        * (1.0 + (1.0 - fuel_kg / 110.0) * 0.03)
+        * (0.9 + driver_skill * 0.1)
+        * (1.0 - rain_probability * 0.20)
+        * (1.0 - dirty_air_penalty)
+        * (1.0 + (track_grip - 1.0) * 0.01)
+        * (1.0 + noise)
+    )
+    return np.maximum(50.0, result)
+
+
+def tire_wear(
+    current_wear: np.ndarray,
+    compound_code: np.ndarray,
+    mode_code: np.ndarray,
+    noise: np.ndarray,
+    dirty_air_factor: np.ndarray | float = 0.0,
+) -> np.ndarray:
+    """
+    Array version of calculate_tire_wear (cliff above 50% wear included).
+    `noise` is the gaussian draw (sigma 0.05) per car.
+    """
+    dirty_air_mult = 1.0 + DIRTY_AIR_TIRE_COEFF * np.clip(dirty_air_factor, 0.0, 1.0)
+    cliff_mult = 1.0 + np.maximum(current_wear - 0.5, 0.0) * 2.0
+    delta = (
+        WEAR_RATE_BY_COMPOUND[compound_code]
+        * WEAR_MULT_BY_MODE[mode_code]
+        * dirty_air_mult
+        * cliff_mult
+        * np.maximum(0.5, 1.0 + noise)
+    )
+    return np.minimum(1.0, current_wear + delta)
+
+
+def fuel_consumption(
+    current_fuel_kg: np.ndarray,
+    mode_code: np.ndarray,
+    base_consumption: float = 1.75,
+) -> np.ndarray:
+    """Array version of calculate_fuel_consumption (remaining fuel after one lap)."""
+    return np.maximum(0.0, current_fuel_kg - base_consumption * FUEL_MULT_BY_MODE[mode_code])
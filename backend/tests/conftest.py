@@ -2,6 +2,48 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add the backend directory to Python path
 backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
\ No newline at end of file
+sys.path.insert(0, str(backend_dir))
+
+from app.models.race_state import (  # noqa: E402
+    Car, CarIdentity, CarStrategy, CarSystems, CarTelemetry, CarTiming,
+    Meta, RaceState, Sector, SectorType, TireCompound, TireState, Track, Weather,
+)
+
+
+def _car(driver, position, interval, team="Ferrari"):
+    return Car(
+        identity=CarIdentity(driver=driver, team=team),
+        telemetry=CarTelemetry(
+            speed=280.0, fuel=50.0, lap_progress=0.25,
+            tire_state=TireState(compound=TireCompound.SOFT, age=position, wear=0.1),
+        ),
+        systems=CarSystems(),
+        strategy=CarStrategy(),
+        timing=CarTiming(position=position, lap=3, sector=0, interval=interval),
+        pit_stops=0,
+    )
+
+
+@pytest.fixture
+def make_car():
+    """Factory for a racing car on SOFTs aged `position` laps: make_car(driver, position, interval)."""
+    return _car
+
+
+@pytest.fixture
+def race_state():
+    """Tick 10 of a 50-lap race on a 5 km test track: LEC leads HAM by 0.8s."""
+    track = Track(
+        id="test", name="Test", length=5000,
+        sectors=[Sector(sector_type=SectorType.FAST, length=1000)] * 3,
+        weather=Weather(rain_probability=0.0, temperature=25, wind_speed=0),
+    )
+    return RaceState(
+        meta=Meta(seed=1, tick=10, timestamp=0, laps_total=50),
+        track=track,
+        cars=[_car("LEC", 1, None), _car("HAM", 2, 0.8)],
+    )
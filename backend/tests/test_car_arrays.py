@@ -0,0 +1,156 @@
+"""
+Tests for the structure-of-arrays view of RaceState.cars.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.ml.feature_kernel import FEATURE_COLS, build_features
+from app.models.race_state import (
+    CAR_STATUS_CODES, CARS_ADAPTER, DRIVER_CODES, TIRE_COMPOUND_CODES, TIRE_WEAR_SCALE,
+    Car, CarArrays, CarStatus, Sector, SectorType, TireCompound, TireState,
+    assert_invariants, intern_code, pack_tire, unpack_tire, unpack_tires,
+)
+
+
+def test_arrays_project_car_fields(race_state):
+    arrays = race_state.arrays
+    assert arrays.driver == ["LEC", "HAM"]
+    assert arrays.tire_compound == ["SOFT", "SOFT"]
+    assert list(arrays.position) == [1, 2]
+    assert list(arrays.tire_age) == [1, 2]
+    assert math.isnan(arrays.interval[0])
+    assert arrays.interval[1] == 0.8
+
+
+def test_arrays_reflect_in_place_car_updates(race_state):
+    state = race_state
+    assert state.arrays.position[0] == 1
+
+    # Same tick, same cars list: the view must still see the mutation
+    state.cars[0].timing.position = 3
+    state.cars[1].telemetry.speed = 250.0
+    arrays = state.arrays
+    assert arrays.position[0] == 3
+    assert arrays.speed[1] == 250.0
+
+
+def test_build_features_fills_model_columns(race_state):
+    state = race_state
+    arrays = state.arrays
+    codes = np.array([1, -1])
+    out = np.full((2, len(FEATURE_COLS)), np.nan)
+
+    build_features(arrays, 50, True, False, True, codes, codes, codes, out)
+
+    row = dict(zip(FEATURE_COLS, out[1]))
+    assert row["laps_remaining"] == 47
+    assert row["gap_to_car_ahead"] == 0.8
+    assert out[0, FEATURE_COLS.index("gap_to_car_ahead")] == 0.0
+    assert (row["sc_active"], row["vsc_active"], row["drs_enabled"]) == (1, 0, 1)
+    assert row["driver_code"] == -1
+    assert not np.isnan(out).any()
+
+
+def test_to_cars_writes_columns_back(race_state):
+    state = race_state
+    arrays = state.arrays
+    arrays.speed[1] = 301.5
+    arrays.tire_age[0] = 7
+    arrays.interval[1] = np.nan
+    arrays.drs_active[1] = True
+    arrays.compound_code[1] = TIRE_COMPOUND_CODES[TireCompound.HARD]
+    arrays.status_code[0] = CAR_STATUS_CODES[CarStatus.DNF]
+
+    cars = arrays.to_cars(state.cars)
+
+    assert cars is state.cars
+    assert cars[1].telemetry.speed == 301.5
+    assert cars[0].telemetry.tire_state.age == 7
+    assert cars[1].telemetry.tire_state.age == 2
+    assert cars[1].timing.interval is None
+    assert cars[1].systems.drs_active is True
+    assert cars[1].telemetry.tire_state.compound is TireCompound.HARD
+    assert cars[0].status is CarStatus.DNF
+
+
+def test_car_from_flat_matches_nested_constructor(make_car):
+    flat = Car.from_flat(
+        driver="LEC", team="Ferrari", speed=280.0, fuel=50.0, lap_progress=0.25,
+        compound="SOFT", tire_age=2, tire_wear=0.1,
+        position=2, lap=3, interval=0.8, pit_stops=0,
+    )
+    assert flat == make_car("LEC", 2, 0.8)
+
+
+def test_cars_adapter_matches_per_car_dump(race_state):
+    cars = race_state.cars
+    assert CARS_ADAPTER.dump_python(cars, mode="json") == [c.model_dump(mode="json") for c in cars]
+
+
+def test_tire_packing_round_trip(race_state):
+    arrays = race_state.arrays
+    packed = arrays.packed_tires()
+    assert packed.dtype == np.uint32
+
+    codes, ages, wears = unpack_tires(packed)
+    assert (codes == arrays.compound_code).all()
+    assert (ages == arrays.tire_age).all()
+    assert np.abs(wears - arrays.tire_wear).max() <= 0.5 / TIRE_WEAR_SCALE
+
+    tire = TireState(compound=TireCompound.INTERMEDIATE, age=300, wear=1.0)
+    assert unpack_tire(pack_tire(tire)) == TireState(compound=TireCompound.INTERMEDIATE, age=255, wear=1.0)
+
+
+def test_running_order_by_race_distance(race_state, make_car):
+    state = race_state
+    state.cars.append(make_car("VER", 3, 0.5))
+    state.cars[1].telemetry.lap_progress = 0.9  # HAM passes LEC
+    state.cars[2].status = CarStatus.DNF  # VER retired, furthest along
+    state.cars[2].telemetry.lap_progress = 0.95
+    arrays = CarArrays.from_cars(state.cars)
+
+    assert list(arrays.assign_positions()) == [1, 0, 2]
+    assert list(arrays.position) == [2, 1, 3]
+    assert [c.identity.driver for c in state.cars] == ["LEC", "HAM", "VER"]
+
+
+def test_assert_invariants_catches_unvalidated_writes(race_state):
+    state = race_state
+    assert_invariants(state)
+
+    arrays = state.arrays
+    arrays.momentum[1] = 1.5  # written back by assignment, so Car's bound isn't checked
+    arrays.to_cars(state.cars)
+    with pytest.raises(AssertionError, match="momentum.*HAM"):
+        assert_invariants(state)
+
+
+def test_driver_and_team_codes_are_interned(race_state, make_car):
+    state = race_state
+    state.cars.append(make_car("VER", 3, 0.5, team="Red Bull"))
+    arrays = CarArrays.from_cars(state.cars)
+
+    assert arrays.team_code[0] == arrays.team_code[1] != arrays.team_code[2]
+    assert len(set(arrays.driver_code.tolist())) == 3
+    assert (CarArrays.from_cars(state.cars).driver_code == arrays.driver_code).all()
+    assert DRIVER_CODES["VER"] == arrays.driver_code[2]
+
+
+def test_intern_code_is_unique_across_threads():
+    table = {}
+    names = [f"D{i:03d}" for i in range(400)]
+    with ThreadPoolExecutor(8) as pool:
+        codes = dict(zip(names, pool.map(lambda name: intern_code(table, name), names)))
+    assert codes == table
+    assert sorted(table.values()) == list(range(len(names)))
+
+
+def test_sector_get_interns_identical_sectors():
+    fast = Sector.get(SectorType.FAST, 1931)
+    assert Sector.get("FAST", 1931) is fast
+    assert fast == Sector(sector_type=SectorType.FAST, length=1931)
+    assert Sector.get(SectorType.SLOW, 1931) is not fast
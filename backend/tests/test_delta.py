@@ -0,0 +1,116 @@
+"""
+Tests for per-tick RaceState delta encoding.
+"""
+
+import json
+
+from app.models.delta import RaceStateDeltaEncoder
+from app.models.race_state import Event, EventType, RaceControl, RaceState
+
+
+def test_first_encode_is_full_snapshot(race_state):
+    out = RaceStateDeltaEncoder().encode(race_state)
+    assert out["full"]["meta"]["tick"] == 10
+    assert len(out["full"]["cars"]) == 2
+
+
+def test_delta_contains_only_changed_fields(race_state):
+    state = race_state
+    encoder = RaceStateDeltaEncoder()
+    encoder.encode(state)
+
+    state.meta.tick += 1
+    state.cars[1].telemetry.speed = 290.0
+    state.cars[0].timing.interval = 0.4  # None -> value
+    state.race_control = RaceControl.VSC
+    state.add_event(Event.safe_new(11, 3, EventType.VIRTUAL_SAFETY_CAR))
+
+    delta = encoder.encode(state)["delta"]
+    assert delta["tick"] == 11
+    assert delta["cars"] == [(0, {"interval": 0.4}), (1, {"speed": 290.0})]
+    assert [e["event_type"] for e in delta["new_events"]] == ["VIRTUAL_SAFETY_CAR"]
+    assert delta["race_control"] == "VSC"
+
+    state.meta.tick += 1
+    delta = encoder.encode(state)["delta"]
+    assert delta["cars"] == []
+    assert delta["new_events"] == []
+    assert delta["race_control"] is None
+    assert delta["order"] is None
+
+
+def test_overtake_is_a_delta_not_a_snapshot(race_state):
+    state = race_state
+    encoder = RaceStateDeltaEncoder()
+    encoder.encode(state)
+
+    # HAM passes LEC; the producer re-sorts cars by position
+    lec, ham = state.cars
+    lec.timing.position, ham.timing.position = 2, 1
+    state.cars = [ham, lec]
+    state.meta.tick += 1
+
+    out = encoder.encode(state)
+    assert "full" not in out
+    delta = out["delta"]
+    assert delta["order"] == ["HAM", "LEC"]
+    assert delta["cars"] == [(0, {"position": 1}), (1, {"position": 2})]
+
+    state.meta.tick += 1
+    assert encoder.encode(state)["delta"]["order"] is None
+
+    # A different set of drivers still needs a snapshot
+    state.cars = [ham]
+    assert "full" in encoder.encode(state)
+
+
+def test_copied_state_does_not_resend_events(race_state):
+    state = race_state
+    state.add_event(Event.safe_new(10, 3, EventType.VIRTUAL_SAFETY_CAR))
+    encoder = RaceStateDeltaEncoder()
+    encoder.encode(state)
+
+    # Deep copy / deserialisation rebuilds the Event objects
+    state = RaceState.model_validate_json(state.model_dump_json())
+    state.meta.tick += 1
+    assert encoder.encode(state)["delta"]["new_events"] == []
+
+    state = state.model_copy(deep=True)
+    state.add_event(Event.safe_new(11, 3, EventType.SAFETY_CAR))
+    delta = encoder.encode(state)["delta"]
+    assert [e["event_type"] for e in delta["new_events"]] == ["SAFETY_CAR"]
+
+
+def test_encode_json_matches_encode(race_state):
+    state = race_state
+    reference, encoder = RaceStateDeltaEncoder(), RaceStateDeltaEncoder()
+    assert json.loads(encoder.encode_json(state)) == reference.encode(state)
+
+    state.meta.tick += 1
+    state.cars[0].telemetry.fuel = 49.5
+    state.add_event(Event.safe_new(11, 3, EventType.YELLOW_FLAG))
+    expected = json.loads(json.dumps(reference.encode(state)))
+    assert json.loads(encoder.encode_json(state)) == expected
+
+
+def test_hot_cold_dumps_round_trip(race_state):
+    state = race_state
+    cold, hot = state.cold_dump(), state.hot_dump()
+    assert set(cold) == {"schema_version", "track", "meta", "cars"}
+    assert cold["cars"][0] == {"identity": {"driver": "LEC", "team": "Ferrari"}}
+    assert "track" not in hot and "identity" not in hot["cars"][0]
+    assert hot["meta"] == {"tick": 10, "timestamp": 0}
+
+    assert RaceState.from_dumps(cold, hot) == state
+
+
+def test_quantized_deltas_skip_sub_precision_changes(race_state):
+    state = race_state
+    encoder = RaceStateDeltaEncoder(quantize=True)
+    encoder.encode(state)
+
+    state.meta.tick += 1
+    state.cars[0].telemetry.speed = 280.01  # below 0.1 km/h display precision
+    state.cars[1].telemetry.lap_progress = 0.2512345
+    delta = encoder.encode(state)["delta"]
+    assert delta["cars"] == [(1, {"lap_progress": 0.2512})]
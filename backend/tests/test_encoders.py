@@ -0,0 +1,27 @@
+"""
+Tests for the shared categorical vocabularies used by training and inference.
+"""
+
+import pandas as pd
+
+from app.ml.encoders import DRIVERS, TEAMS, load_encoders, save_encoders
+
+
+def test_categorical_codes_match_sorted_vocabulary():
+    # Same call as train_model.py / train_pit_model.py; SAR is outside the 2025 grid
+    labels = pd.Series(["VER", "NOR", "SAR", "HAM"])
+    codes = pd.Index(DRIVERS).get_indexer(labels)
+    lookup = {d: i for i, d in enumerate(DRIVERS)}
+    assert list(codes) == [lookup.get(d, -1) for d in labels]
+    assert codes[2] == -1
+
+
+def test_load_encoders_prefers_saved_file(tmp_path):
+    path = tmp_path / "encoders.json"
+    defaults = {"driver": DRIVERS, "team": TEAMS}
+    assert load_encoders(str(path), defaults) == defaults
+
+    save_encoders(str(path), {"driver": ["ZZZ", "AAA"]})
+    loaded = load_encoders(str(path), defaults)
+    assert loaded["driver"] == ["AAA", "ZZZ"]
+    assert loaded["team"] == TEAMS
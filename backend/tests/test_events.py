@@ -0,0 +1,61 @@
+"""
+Tests for race Event construction.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.event_payloads import PitStopPayload, typed_payload, validate_event
+from app.models.race_state import MAX_EVENTS, Event, EventType, TireCompound
+
+
+def test_safe_new_matches_validated_event():
+    trusted = Event.safe_new(120, 3, EventType.OVERTAKE, driver="VER", payload={"on": "LEC"})
+    validated = Event(tick=120, lap=3, event_type=EventType.OVERTAKE, driver="VER", payload={"on": "LEC"})
+    assert trusted == validated
+    assert Event.safe_new(0, 0, EventType.GREEN_FLAG).payload == {}
+
+
+def test_validating_constructor_still_rejects_bad_input():
+    with pytest.raises(ValidationError):
+        Event(tick=-1, lap=0, event_type=EventType.DNF)
+
+
+def test_add_event_keeps_most_recent_window(race_state):
+    state = race_state
+    for tick in range(MAX_EVENTS + 10):
+        state.add_event(Event.safe_new(tick, 0, EventType.LAP_COMPLETE))
+
+    assert len(state.events) == MAX_EVENTS
+    assert state.events[0].tick == 10
+    assert state.events[-1].tick == MAX_EVENTS + 9
+
+
+def test_typed_payload_dispatches_on_event_type():
+    pit = Event(tick=5, lap=12, event_type=EventType.PIT_STOP, driver="VER",
+                payload={"compound": "HARD", "pit_lane_time": 21.4})
+    parsed = typed_payload(pit)
+    assert isinstance(parsed, PitStopPayload)
+    assert parsed.compound is TireCompound.HARD
+
+    flag = Event(tick=5, lap=12, event_type=EventType.YELLOW_FLAG, payload={"sector": 2})
+    assert typed_payload(flag) == {"sector": 2}
+
+    with pytest.raises(ValidationError):
+        typed_payload(Event(tick=5, lap=12, event_type=EventType.OVERTAKE, payload={}))
+
+
+def test_validate_event_checks_payload_schema():
+    raw = {"tick": 5, "lap": 12, "event_type": "PIT_STOP", "driver": "VER",
+           "payload": {"compound": "HARD", "pit_lane_time": 21.4}}
+    event = validate_event(raw)
+    assert type(event) is Event
+    assert event == Event.model_validate(raw)
+
+    assert validate_event({"tick": 1, "lap": 1, "event_type": "DNF"}).payload == {}
+    assert validate_event({"tick": 1, "lap": 1, "event_type": "GREEN_FLAG", "payload": {"x": 1}}).payload == {"x": 1}
+
+    with pytest.raises(ValidationError):
+        validate_event({**raw, "payload": {"compound": "SLICK"}})
+    with pytest.raises(ValidationError):
+        validate_event({**raw, "tick": -1})
@@ -0,0 +1,35 @@
+"""
+Tests for pit-stop label extraction from recorded race states.
+"""
+
+from app.ml.extract_pit_data import DriverHistory
+
+
+def _history(laps, pit_stops, tire_ages):
+    history = DriverHistory()
+    for lap, stops, age in zip(laps, pit_stops, tire_ages):
+        history.lap.append(lap)
+        history.position.append(1)
+        history.tire_age.append(age)
+        history.tire_wear.append(0.1)
+        history.tire_compound.append("MEDIUM")
+        history.gap_to_ahead.append(999.0)
+        history.sc_active.append(0)
+        history.vsc_active.append(0)
+        history.pit_stops.append(stops)
+        history.team.append("Ferrari")
+    return history
+
+
+def test_pit_label_marks_lap_before_stop():
+    df = _history([1, 2, 3, 4], [0, 0, 1, 1], [1, 2, 0, 1]).to_frame("LEC")
+    assert list(df["lap"]) == [1, 2, 3]
+    assert list(df["pit_next_lap"]) == [0, 1, 0]
+    assert (df["driver"] == "LEC").all()
+
+
+def test_pit_label_detects_tire_age_reset_and_sorts_by_lap():
+    # Out-of-order laps, pit counter missing the stop but tyre age reset
+    df = _history([3, 1, 2], [0, 0, 0], [0, 10, 11]).to_frame("HAM")
+    assert list(df["lap"]) == [1, 2]
+    assert list(df["pit_next_lap"]) == [0, 1]
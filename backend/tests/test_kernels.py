@@ -0,0 +1,78 @@
+"""
+Array physics kernels must match the scalar physics helpers car-for-car
+"""
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pytest
+
+from app.models.race_state import DrivingMode, TireCompound
+from app.simulation import kernels
+from app.simulation.physics import (
+    calculate_dirty_air_factor, calculate_dirty_air_penalty, calculate_speed,
+    calculate_tire_wear, calculate_fuel_consumption,
+)
+
+
+class FixedRNG:
+    """Stands in for SeededRNG: gauss() returns the pre-drawn values in order."""
+    def __init__(self, values):
+        self._values = iter(values)
+
+    def gauss(self, mu=0.0, sigma=1.0):
+        return next(self._values)
+
+
+COMPOUNDS = list(TireCompound)
+MODES = list(DrivingMode)
+
+
+@pytest.fixture
+def grid():
+    rng = np.random.default_rng(7)
+    n = 20
+    return {
+        "gap": np.concatenate([[np.nan, -0.1, 0.0, 2.0], rng.uniform(0.0, 3.0, n - 4)]),
+        "wear": rng.uniform(0.0, 1.0, n),
+        "fuel": rng.uniform(0.0, 110.0, n),
+        "skill": rng.uniform(0.8, 0.99, n),
+        "compound": rng.integers(0, len(COMPOUNDS), n).astype(np.uint8),
+        "mode": rng.integers(0, len(MODES), n).astype(np.uint8),
+        "noise": rng.normal(0.0, 0.05, n),
+    }
+
+
+def test_dirty_air_matches_scalar(grid):
+    gaps = grid["gap"]
+    expected = [0.0 if np.isnan(g) else calculate_dirty_air_factor(g) for g in gaps]
+    assert np.allclose(kernels.dirty_air_factor(gaps), expected)
+
+    expected = [0.0 if np.isnan(g) else calculate_dirty_air_penalty(g, "MEDIUM") for g in gaps]
+    assert np.allclose(kernels.dirty_air_penalty(gaps, "MEDIUM"), expected)
+    assert not kernels.dirty_air_penalty(gaps, "FAST").any()
+
+
+def test_speed_wear_fuel_match_scalar(grid):
+    g = grid
+    factor = kernels.dirty_air_factor(g["gap"])
+    modes = [MODES[m].value for m in g["mode"]]
+
+    speeds = kernels.speed(200.0, g["wear"], g["fuel"], g["skill"], g["mode"], g["noise"],
+                           rain_probability=0.3, track_grip=1.1)
+    expected = [
+        calculate_speed(200.0, w, f, s, FixedRNG([n]), mode, rain_probability=0.3, track_grip=1.1)
+        for w, f, s, n, mode in zip(g["wear"], g["fuel"], g["skill"], g["noise"], modes)
+    ]
+    assert np.allclose(speeds, expected)
+
+    wear = kernels.tire_wear(g["wear"], g["compound"], g["mode"], g["noise"], factor)
+    expected = [
+        calculate_tire_wear(w, COMPOUNDS[c].value, FixedRNG([n]), mode, d)
+        for w, c, n, mode, d in zip(g["wear"], g["compound"], g["noise"], modes, factor)
+    ]
+    assert np.allclose(wear, expected)
+
+    fuel = kernels.fuel_consumption(g["fuel"], g["mode"])
+    assert np.allclose(fuel, [calculate_fuel_consumption(f, mode) for f, mode in zip(g["fuel"], modes)])
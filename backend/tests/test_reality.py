@@ -9,7 +9,7 @@ import json
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
-from app.models.race_state import RaceState
+from app.models.race_state import CarIdentity, RaceState
 from app.data_ingestion.circuit_mapping import get_track_for_circuit
 from app.data_ingestion.storage import save_race, load_race, list_ingested_races
 from app.data_ingestion.calibration.compare import compare_sim_vs_real, calculate_overall_score
@@ -84,7 +84,7 @@ def mock_states():
         cars = []
         for pos, driver in enumerate(positions, 1):
             car = MagicMock()
-            car.identity.driver = driver
+            car.identity = CarIdentity(driver=driver, team="Test")  # frozen: replace, don't mutate
             car.timing.lap = lap
             car.timing.position = pos
             car.timing.last_lap_time = 80.0 + pos # Dummy time
@@ -124,7 +124,7 @@ def test_comparison_missing_drivers():
         cars = []
         for i, d in enumerate(drivers):
             c = MagicMock()
-            c.identity.driver = d
+            c.identity = CarIdentity(driver=d, team="Test")
             c.timing.lap = lap
             c.timing.position = i+1
             c.timing.last_lap_time = 80.0
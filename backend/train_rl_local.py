@@ -23,6 +23,8 @@ import random
 import sys
 import time
 
+from app.ml.rl_predictor import export_deterministic_actor, export_policy_weights
+
 # ---------------------------------------------------------------------------
 # CONFIG
 # ---------------------------------------------------------------------------
@@ -274,4 +276,10 @@ if __name__ == "__main__":
     model.save(model_path)
     
     print(f"\n✅ Model saved to: {model_path}.zip")
+
+    # Inference-only TorchScript actor (loaded in preference to the zip)
+    export_deterministic_actor(model, f"{model_path}.pt")
+    print(f"✅ TorchScript actor saved to: {model_path}.pt")
+    export_policy_weights(model, f"{model_path}.policy.pth")
+    print(f"✅ Policy weights saved to: {model_path}.policy.pth")
     print(f"⏱️  Total time: {time.time() - start_time:.1f}s")